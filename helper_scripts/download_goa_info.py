@@ -1,18 +1,18 @@
 import pandas as pd 
+import re
 from pathlib import Path
 import urllib.request
 import urllib.error
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 
 ftp_urls = [
     "ftp://ftp.ebi.ac.uk/pub/databases/GO/goa/proteomes/proteome2taxid",
     "ftp://ftp.uniprot.org/pub/databases/uniprot/current_release/knowledgebase/reference_proteomes/README"
 ]
 
-print("Starting download process...")
-
-for ftp_url in ftp_urls:
-    print("-" * 40)
+def download_one(ftp_url):
+    messages = ["-" * 40]
 
     parsed_url = urllib.parse.urlparse(ftp_url)
     url_path_str = parsed_url.path
@@ -22,43 +22,45 @@ for ftp_url in ftp_urls:
     local_path = Path(local_filename_str)
 
     full_local_path = local_path.resolve()
-    print(f"Processing URL: {ftp_url}")
-    print(f"Target local file: {full_local_path}")
-    print(f"Checking existence...")
+    messages.append(f"Processing URL: {ftp_url}")
+    messages.append(f"Target local file: {full_local_path}")
+    messages.append(f"Checking existence...")
 
     if not local_path.exists():
-        print(f"-> File '{local_path.name}' not found locally. Attempting download...")
+        messages.append(f"-> File '{local_path.name}' not found locally. Attempting download...")
         urllib.request.urlretrieve(ftp_url, local_path)
-        print(f"-> Download complete! File saved as '{local_path}'.")
+        messages.append(f"-> Download complete! File saved as '{local_path}'.")
         
     else:
-        print(f"-> File '{local_path.name}' already exists. Skipping download.")
+        messages.append(f"-> File '{local_path.name}' already exists. Skipping download.")
+
+    return "\n".join(messages)
+
+print("Starting download process...")
+
+with ThreadPoolExecutor(max_workers=len(ftp_urls)) as executor:
+    for report in executor.map(download_one, ftp_urls):
+        print(report)
 
 print("-" * 40)
 print("Download process finished.")
 
 header_line = "Proteome_ID\tTax_ID\tOSCODE\tSUPERREGNUM\t#(1)\t#(2)\t#(3)\tSpecies Name"
-found_header = False
-lines_written = 0
 input_filename = "README"
 output_filename = "processed_README"
 
-with open(input_filename, 'r', encoding='utf-8') as infile, \
-        open(output_filename, 'w', encoding='utf-8') as outfile:
-
-    for line in infile:
-        stripped_line = line.strip()
-
-        if found_header:
-            if stripped_line == "":
-                break
-            else:
-                outfile.write(line)
-                lines_written += 1
-        elif stripped_line == header_line:
-            found_header = True
-            outfile.write(line)
-            lines_written += 1
+readme_text = Path(input_filename).read_text(encoding='utf-8')
+header_match = re.search(rf"^[^\S\n]*{re.escape(header_line)}[^\S\n]*$", readme_text, re.M)
+found_header = header_match is not None
+section = ""
+
+if found_header:
+    header_start = header_match.start()
+    blank_line = re.compile(r"\n[^\S\n]*(?:\n|$)").search(readme_text, header_start)
+    section = readme_text[header_start:blank_line.start() + 1] if blank_line else readme_text[header_start:]
+
+Path(output_filename).write_text(section, encoding='utf-8')
+lines_written = len(section.splitlines())
 
 if not found_header:
     print(f"Error: Header line not found in '{input_filename}'")
@@ -1,41 +1,23 @@
-import pandas as pd
+import polars as pl
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from contextlib import contextmanager
 import os 
+import argparse
+import shutil
+import tempfile
+
+try:
+    from isal.igzip import open as gzip_open
+except ImportError:
+    from gzip import open as gzip_open
 
 background_pop = Path("background_pop")
 outdir = Path("final_background_pop")
-
-print("Creating output directory...")
-outdir.mkdir(parents=True, exist_ok=True)
-
-print("Reading UniProt metadata...")
-uniprot_info = pd.read_csv(
-    "processed_README",
-    sep='\t'
-).drop(columns=["Proteome_ID", "OSCODE", "#(1)", "#(2)", "#(3)"]).rename(columns={
-    "Species Name": "Species_Name"
-})
-
-uniprot_cel_orgs = uniprot_info[uniprot_info["SUPERREGNUM"] != "viruses"]
-
-print("Reading GOA metadata...")
-goa_info = pd.read_csv(
-    "proteome2taxid",
-    sep='\t',
-    header=None,
-    names=[
-        "Species_Name",
-        "Tax_ID",
-        "GOA_file"
-    ])
-
-cellular_organisms = goa_info[goa_info['Tax_ID'].isin(uniprot_cel_orgs['Tax_ID'])]
-cellular_organisms['index'] = cellular_organisms['GOA_file'].str.split('.').str[0]
-index_df = cellular_organisms[['index', 'Tax_ID']]
-
-print("Creating Tax ID dictionary...")
-tax_id_dict = index_df.set_index('index')['Tax_ID'].to_dict()
+metadata_files = [Path("processed_README"), Path("proteome2taxid")]
+tax_id_cache = Path("tax_id_dict.parquet")
+tax_id_cache_version = 1
 
 column_names = [
     "DB", "DB_Object_ID", "DB_Object_Symbol", "Relation", "GO_ID",
@@ -45,64 +27,246 @@ column_names = [
     "Annotation_Extension", "Gene_Product_Form_ID"
 ]
 
-dtypes = {
-    "DB": "category", "DB_Object_ID": "category", "DB_Object_Symbol": "category",
-    "Relation": "object", "GO_ID": "category", "DB:Reference_(|DB:Reference)": "category",
-    "Evidence_Code": "category", "With_(or)_From": "object", "Aspect": "category",
-    "DB_Object_Name": "category", "DB_Object_Synonym_(|Synonym)": "category",
-    "DB_Object_Type": "category", "Taxon_(|taxon)": "category", "Date": "int64",
-    "Assigned_By": "category", "Annotation_Extension": "object",
-    "Gene_Product_Form_ID": "object",
+used_column_dtypes = {
+    "DB": pl.Categorical,
+    "DB_Object_ID": pl.Utf8,
+    "Relation": pl.Utf8,
+    "GO_ID": pl.Utf8,
+    "Evidence_Code": pl.Utf8,
+    "DB_Object_Type": pl.Categorical,
+}
+
+output_columns = ['DB_Object_ID', 'GO_ID', 'Evidence_Code']
+
+gaf_schema = {
+    column: used_column_dtypes.get(column, pl.Utf8)
+    for column in column_names
+}
+
+gaf_csv_options = {
+    "separator": '\t',
+    "has_header": False,
+    "comment_prefix": "!",
+    "quote_char": None,
+    "schema": gaf_schema,
+    "truncate_ragged_lines": True,
 }
 
-def create_background(file, outdir, taxon_id, column_names, dtypes):
+@contextmanager
+def goa_source(file, output_dir):
+    if not file.name.endswith(".gz"):
+        yield file
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".goa", dir=output_dir, delete=False) as decompressed:
+        pass
+    try:
+        with gzip_open(file, "rb") as compressed, open(decompressed.name, "wb") as handle:
+            shutil.copyfileobj(compressed, handle, 1 << 20)
+        yield Path(decompressed.name)
+    finally:
+        os.unlink(decompressed.name)
+
+background_filter = (
+    (pl.col("DB") == "UniProtKB") &
+    ~pl.col("Relation").str.starts_with("NOT").fill_null(False) &
+    (pl.col("DB_Object_Type") == "protein")
+)
+
+small_file_bytes = 64 << 20
+small_file_bucket_bytes = 256 << 20
+
+def write_background(background, taxon_id, output_dir, output_format):
+    if output_format == "parquet":
+        mod_gaf = output_dir.joinpath(f"{taxon_id}_background.parquet")
+        if isinstance(background, pl.LazyFrame):
+            background.sink_parquet(mod_gaf, compression="zstd", compression_level=3)
+        else:
+            background.write_parquet(mod_gaf, compression="zstd", compression_level=3)
+    else:
+        mod_gaf = output_dir.joinpath(f"{taxon_id}_background.txt")
+        if isinstance(background, pl.LazyFrame):
+            background.sink_csv(mod_gaf, separator='\t', include_header=False)
+        else:
+            background.write_csv(mod_gaf, separator='\t', include_header=False)
+
+def create_background(file, taxon_id, output_dir, output_format):
     """
     Reads a GOA file, filters it, and saves the background population.
     Returns the taxon_id upon success or raises an exception on failure.
     """
     try:
         print(f"Processing {taxon_id} from {file.name}...")
-        gaf = pd.read_csv(
-            file,
-            sep='\t',
-            header=None,
-            comment="!",
-            names=column_names,
-            dtype=dtypes,
-            low_memory=False
-        )
-
-        filtered_gaf = gaf[
-            (gaf["DB"] == "UniProtKB") &
-            (~gaf["Relation"].str.contains('NOT', case=False, na=False)) &
-            (gaf["DB_Object_Type"] == "protein")
-        ]
-
-        filtered_gaf = filtered_gaf[['DB_Object_ID', 'GO_ID', 'Evidence_Code']].drop_duplicates()
-
-        mod_gaf = outdir.joinpath(f"{taxon_id}_background.txt")
-
-        filtered_gaf.to_csv(mod_gaf, sep='\t', index=False, header=False)
+        with goa_source(file, output_dir) as source:
+            background = (
+                pl.scan_csv(source, **gaf_csv_options)
+                .filter(background_filter)
+                .select(output_columns)
+                .unique()
+            )
+            write_background(background, taxon_id, output_dir, output_format)
         return taxon_id 
         
     except Exception as e:
         print(f"!!! ERROR processing {taxon_id} from {file.name}: {e}")
         raise Exception(f"Error in create_background for {taxon_id}") from e
 
+def create_background_batch(files, taxon_ids, output_dir, output_format):
+    """
+    Reads several small GOA files in a single scan and saves one background
+    population per file. Raises an exception if any part of the batch fails.
+    """
+    try:
+        print(f"Processing {len(files)} small files in one scan...")
+        backgrounds = (
+            pl.concat([
+                pl.scan_csv(file, **gaf_csv_options).with_columns(file_index=pl.lit(index, dtype=pl.UInt32))
+                for index, file in enumerate(files)
+            ])
+            .filter(background_filter)
+            .select(["file_index", *output_columns])
+            .unique()
+            .collect()
+            .partition_by("file_index", as_dict=True, include_key=False)
+        )
+
+        empty_background = pl.DataFrame(schema={column: pl.Utf8 for column in output_columns})
+        for index, taxon_id in enumerate(taxon_ids):
+            background = backgrounds.get((index,), empty_background)
+            write_background(background, taxon_id, output_dir, output_format)
+        return taxon_ids
+
+    except Exception as e:
+        print(f"!!! ERROR processing batch of {len(files)} small files: {e}")
+        raise Exception(f"Error in create_background_batch for {taxon_ids}") from e
+
+def run_background_job(job, output_dir, output_format):
+    files, taxon_ids = job
+    if len(files) > 1:
+        try:
+            create_background_batch(files, taxon_ids, output_dir, output_format)
+            return [(taxon_id, None) for taxon_id in taxon_ids]
+        except Exception:
+            print(f"Retrying the {len(files)} files of the failed batch one at a time...")
+
+    results = []
+    for file, taxon_id in zip(files, taxon_ids):
+        try:
+            create_background(file, taxon_id, output_dir, output_format)
+            results.append((taxon_id, None))
+        except Exception as exc:
+            results.append((taxon_id, exc))
+    return results
+
+def build_background_jobs(tasks):
+    jobs = []
+    buckets = []
+    bucket_bytes = small_file_bucket_bytes
+
+    for task in tasks:
+        if task["size"] >= small_file_bytes or task["file"].name.endswith(".gz"):
+            jobs.append(([task["file"]], [task["tax_id"]]))
+            continue
+
+        if bucket_bytes + task["size"] > small_file_bucket_bytes:
+            buckets.append(([], []))
+            bucket_bytes = 0
+        buckets[-1][0].append(task["file"])
+        buckets[-1][1].append(task["tax_id"])
+        bucket_bytes += task["size"]
+
+    return jobs + buckets
+
+def build_tax_id_dict():
+    import pandas as pd
+
+    print("Reading UniProt metadata...")
+    uniprot_info = pd.read_csv(
+        "processed_README",
+        sep='\t',
+        usecols=["Tax_ID", "SUPERREGNUM"]
+    )
+
+    uniprot_cel_orgs = uniprot_info[uniprot_info["SUPERREGNUM"] != "viruses"]
+
+    print("Reading GOA metadata...")
+    goa_info = pd.read_csv(
+        "proteome2taxid",
+        sep='\t',
+        header=None,
+        names=[
+            "Species_Name",
+            "Tax_ID",
+            "GOA_file"
+        ],
+        usecols=["Tax_ID", "GOA_file"])
+
+    cellular_organisms = goa_info[goa_info['Tax_ID'].isin(uniprot_cel_orgs['Tax_ID'])]
+    index_df = cellular_organisms.assign(
+        index=cellular_organisms['GOA_file'].str.partition('.')[0]
+    )[['index', 'Tax_ID']]
+
+    print("Creating Tax ID dictionary...")
+    tax_id_dict = index_df.set_index('index')['Tax_ID'].to_dict()
+    return tax_id_dict
+
+def tax_id_cache_key():
+    key = [f"v{tax_id_cache_version}"]
+    for metadata_file in metadata_files:
+        stat = metadata_file.stat()
+        key.append(f"{metadata_file.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(key)
+
+def load_tax_id_dict(rebuild=False):
+    cache_key = tax_id_cache_key()
+    if not rebuild and tax_id_cache.exists():
+        if pl.read_parquet_metadata(tax_id_cache).get("cache_key") == cache_key:
+            print(f"Loading cached Tax ID dictionary from {tax_id_cache}...")
+            return dict(pl.read_parquet(tax_id_cache, columns=["index", "Tax_ID"]).iter_rows())
+        print(f"Cached Tax ID dictionary {tax_id_cache} is out of date, rebuilding...")
+
+    tax_id_dict = build_tax_id_dict()
+    pl.DataFrame({
+        "index": list(tax_id_dict.keys()),
+        "Tax_ID": list(tax_id_dict.values())
+    }).write_parquet(tax_id_cache, metadata={"cache_key": cache_key})
+    return tax_id_dict
+
 def main():
+    parser = argparse.ArgumentParser(description="Create TaxaGO background populations from GOA files.")
+    parser.add_argument(
+        "--output-format",
+        choices=["tsv", "parquet"],
+        default="tsv",
+        help="Write TSV files read by TaxaGO (default) or zstd-compressed Parquet."
+    )
+    parser.add_argument(
+        "--rebuild-tax-id-cache",
+        action="store_true",
+        help=f"Ignore and rebuild the cached Tax ID dictionary ({tax_id_cache})."
+    )
+    args = parser.parse_args()
+
+    print("Creating output directory...")
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    tax_id_dict = load_tax_id_dict(rebuild=args.rebuild_tax_id_cache)
+
     tasks_to_submit = []
-    print(f"Scanning directory {background_pop} for .goa files...")
-    for file in background_pop.iterdir():
-        if file.suffix == ".goa":
-            index = file.name.split(".")[0]
-            if index in tax_id_dict:
-                tax_id = tax_id_dict[index]
-                tasks_to_submit.append({
-                    "file": file,
-                    "tax_id": tax_id
-                })
-            else:
-                print(f"Warning: Index '{index}' from file {file.name} not found in tax_id_dict. Skipping.")
+    print(f"Scanning directory {background_pop} for .goa and .goa.gz files...")
+    with os.scandir(background_pop) as entries:
+        for entry in entries:
+            if entry.name.endswith((".goa", ".goa.gz")):
+                index = entry.name.split(".", 1)[0]
+                if index in tax_id_dict:
+                    tax_id = tax_id_dict[index]
+                    tasks_to_submit.append({
+                        "file": Path(entry.path),
+                        "tax_id": tax_id,
+                        "size": entry.stat().st_size
+                    })
+                else:
+                    print(f"Warning: Index '{index}' from file {entry.name} not found in tax_id_dict. Skipping.")
 
     if not tasks_to_submit:
         print("No .goa files found matching the tax_id dictionary. Exiting.")
@@ -110,33 +274,24 @@ def main():
 
     print(f"Found {len(tasks_to_submit)} files to process.")
 
-    num_workers = max(1, os.cpu_count() - 2) if os.cpu_count() else 4
+    tasks_to_submit.sort(key=lambda task: task["size"], reverse=True)
+
+    num_workers = os.cpu_count() or 4
     print(f"Starting processing with up to {num_workers} parallel workers...")
 
-    futures = []
-    with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        for task in tasks_to_submit:
-            
-            future = executor.submit(
-                create_background,
-                task["file"],
-                outdir,
-                task["tax_id"],
-                column_names, 
-                dtypes        
-            )
-            futures.append(future)
+    jobs = build_background_jobs(tasks_to_submit)
+    process_job = partial(run_background_job, output_dir=outdir, output_format=args.output_format)
 
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
         processed_count = 0
-        total_tasks = len(futures)
-        for future in as_completed(futures):
-            try:
-                completed_tax_id = future.result()
+        total_tasks = len(tasks_to_submit)
+        for job_results in executor.map(process_job, jobs):
+            for completed_tax_id, error in job_results:
                 processed_count += 1
-                print(f"({processed_count}/{total_tasks}) Successfully processed Taxon ID: {completed_tax_id}")
-            except Exception as exc:
-                 processed_count += 1
-                 print(f"({processed_count}/{total_tasks}) A task failed: {exc}")
+                if error is None:
+                    print(f"({processed_count}/{total_tasks}) Successfully processed Taxon ID: {completed_tax_id}")
+                else:
+                    print(f"({processed_count}/{total_tasks}) A task failed: {error}")
 
 
     print(f"\n--- All processing finished. Processed {processed_count} files. ---")
@@ -44,8 +44,6 @@ use petgraph::{
     visit::{EdgeRef, IntoEdgeReferences}
 }; 
 use rayon::prelude::*;
-use itertools::Itertools;
-use strum::IntoEnumIterator;
 use std::collections::VecDeque;
 use fdg::{
     init_force_graph_uniform,
@@ -58,6 +56,7 @@ use fdg::{
     simple::Center,
 };
 use clap::ValueEnum;
+use lazy_static::lazy_static;
 
 #[derive(Debug, Clone, Copy, ValueEnum, PartialEq)]
 pub enum PlotType {
@@ -83,23 +82,174 @@ const QUADRANT_DEFINITIONS: [(f32, f32); QUADRANTS] = [
     (1.0 * QUADRANT_WIDTH, 0.0 * QUADRANT_HEIGHT),
 ];
 
+lazy_static! {
+    static ref PLOT_EXPORT_POOL: rayon::ThreadPool = rayon::ThreadPoolBuilder::new()
+        .num_threads(num_cpus::get_physical().min(rayon::current_num_threads()))
+        .build()
+        .unwrap();
+
+    static ref BAR_PLOT_COLOR_BAR: ColorBar = ColorBar::new()
+        .title(
+            Title::from("-log10(Stat. Sig.)")
+                .side(Side::Right)
+                .font(Font::new().size(12)),
+        )
+        .tick_font(Font::new().size(10))
+        .len_mode(ThicknessMode::Pixels)
+        .len(150)
+        .thickness(15)
+        .x(1.0)
+        .y(0.9)
+        .y_anchor(Anchor::Middle);
+
+    static ref BAR_PLOT_LAYOUT: Layout = Layout::new()
+        .width(460)
+        .height(920)
+        .margin(Margin::new()
+            .left(50)
+            .right(0)
+            .top(30)
+            .bottom(0))
+        .x_axis(
+            Axis::new()
+                .title(Title::with_text("log(Odds Ratio)").font(Font::new().size(12)))
+                .tick_font(Font::new().size(10))
+                .show_line(true)
+                .line_color(NamedColor::Black)
+                .show_grid(true)
+                .grid_color(Rgba::new(0, 0, 0, 0.05))
+                .show_tick_labels(true)
+                .auto_margin(true),
+        )
+        .y_axis(
+            Axis::new() 
+                .title(Title::with_text(""))
+                .tick_font(Font::new().size(12))
+                .show_line(true)
+                .line_color(NamedColor::Black)
+                .show_grid(true)
+                .grid_color(Rgba::new(0, 0, 0, 0.05))
+                .show_tick_labels(true)
+                .auto_margin(true),
+        )
+        .drag_mode(DragMode::False)
+        .bar_gap(0.4);
+
+    static ref BUBBLE_PLOT_LAYOUT: Layout = Layout::new()
+        .width(940)
+        .height(460)
+        .margin(Margin::new()
+            .left(50)
+            .right(0)
+            .top(30)
+            .bottom(15))
+        .x_axis(
+            Axis::new()
+                .title(Title::with_text("log(Odds Ratio)").font(Font::new().size(12)))
+                .tick_font(Font::new().size(10))
+                .show_line(true)
+                .line_color(NamedColor::Black)
+                .show_grid(true)
+                .grid_color(Rgba::new(0, 0, 0, 0.05))
+                .show_tick_labels(true)
+                .auto_margin(true)
+                .range_mode(RangeMode::ToZero),
+        )
+        .y_axis(
+            Axis::new()
+                .title(Title::with_text("-log10(Stat. Sig.)").font(Font::new().size(12)))
+                .tick_font(Font::new().size(10))
+                .show_line(true)
+                .line_color(NamedColor::Black)
+                .show_grid(true)
+                .grid_color(Rgba::new(0, 0, 0, 0.05))
+                .show_tick_labels(true)
+                .auto_margin(true)
+                .range_mode(RangeMode::ToZero),
+        )
+        .legend(
+            Legend::new()
+                .x(1.0)
+                .y(1.0)
+                .trace_group_gap(10)
+                .trace_order(TraceOrder::Grouped) 
+                .item_click(ItemClick::False)
+                .item_double_click(ItemClick::False)
+        );
+
+    static ref NETWORK_PLOT_COLOR_BAR: ColorBar = ColorBar::new()
+        .title(
+            Title::from("log(Odds Ratio)")
+                .side(Side::Right)
+                .font(Font::new().size(12)),
+        )
+        .tick_font(Font::new().size(10))
+        .len_mode(ThicknessMode::Pixels)
+        .len(150)
+        .thickness(15)
+        .x(1.0)
+        .y(0.85)
+        .y_anchor(Anchor::Middle);
+
+    static ref NETWORK_PLOT_LAYOUT: Layout = Layout::new()
+        .width(940)
+        .height(460)
+        .margin(Margin::new()
+            .left(50)
+            .right(0)
+            .top(30)
+            .bottom(0))
+        .x_axis(
+            Axis::new()
+                .show_line(false)
+                .zero_line(false)
+                .show_grid(true)
+                .show_tick_labels(false)
+                .auto_margin(true)
+        )
+        .y_axis(
+            Axis::new() 
+                .show_line(false)
+                .zero_line(false)
+                .show_grid(true)
+                .show_tick_labels(false)
+                .auto_margin(true)
+        )
+        .legend(
+            Legend::new()
+                .x(1.0)
+                .y(0.45)
+                .trace_group_gap(10)
+                .trace_order(TraceOrder::Grouped)
+                .item_click(ItemClick::False)
+                .item_double_click(ItemClick::False)
+        );
+}
+
 pub type JaccardIndex = f32;
-pub type GoTermNetworkGraph = StableGraph<GOTermPlotData, JaccardIndex, Directed>;
-pub type LayoutGraph = ForceGraph<f32, 2, GOTermPlotData, JaccardIndex, Directed>;
+pub type GoTermNetworkGraph = StableGraph<GOTermNodeData, JaccardIndex, Directed>;
+pub type LayoutGraph = ForceGraph<f32, 2, GOTermNodeData, JaccardIndex, Directed>;
 
 #[derive(Debug, Clone)]
 pub struct GOTermPlotData {
     pub go_id: GOTermID,
-    pub name: String,
     pub wrapped_name: String,
-    pub lor: f64,
+    pub lor: f32,
     pub stat_sig: f64,
-    pub minus_log10_p_value: f64,
+    pub minus_log10_p_value: f32,
     pub size_statistic: usize,
     pub namespace: NameSpace,
     pub hover_text: String,
 }
 
+#[derive(Debug, Clone)]
+pub struct GOTermNodeData {
+    pub go_id: GOTermID,
+    pub lor: f32,
+    pub size_statistic: usize,
+    pub hover_text: String,
+}
+
 pub trait EnrichmentResult {
     fn log_odds_ratio(&self) -> f64;
     fn p_value(&self) -> f64;
@@ -135,9 +285,10 @@ impl EnrichmentResult for TaxonomyGOResult {
 
 #[derive(Clone)]
 pub enum ProteinDataProvider<'a> {
-    Species(
-        &'a FxHashMap<String, GOTermToProteinSet>
-    ), 
+    Species {
+        species_data_by_id: &'a FxHashMap<TaxonID, GOTermToProteinSet>,
+        species_name_to_id: &'a FxHashMap<String, TaxonID>,
+    },
     Taxonomy {
         species_data_by_id: &'a FxHashMap<TaxonID, GOTermToProteinSet>,
         taxonomy_to_species_ids: &'a FxHashMap<String, Vec<TaxonID>>,
@@ -151,27 +302,40 @@ impl<'a> ProteinDataProvider<'a> {
         relevant_go_ids: &FxHashSet<GOTermID>,
     ) -> GOTermToProteinSet {
         match self {
-            ProteinDataProvider::Species(species_map) => {
-                species_map.get(taxon_name).cloned().unwrap()
+            ProteinDataProvider::Species {
+                species_data_by_id,
+                species_name_to_id,
+            } => {
+                let species_id = species_name_to_id.get(taxon_name).unwrap();
+                let species_go_map = species_data_by_id.get(species_id).unwrap();
+                relevant_go_ids
+                    .iter()
+                    .filter_map(|go_id| {
+                        species_go_map
+                            .get(go_id)
+                            .map(|proteins| (*go_id, proteins.clone()))
+                    })
+                    .collect()
             }
             ProteinDataProvider::Taxonomy {
                 species_data_by_id,
                 taxonomy_to_species_ids,
             } => {
                 let species_ids = taxonomy_to_species_ids.get(taxon_name).unwrap();
-                let mut aggregated_go_to_proteins: GOTermToProteinSet = FxHashMap::default();
-                for go_id in relevant_go_ids {
-                    let mut proteins_for_go: FxHashSet<Protein> = FxHashSet::default();
-                    for species_id in species_ids {
-                        if let Some(species_go_map) = species_data_by_id.get(species_id) {
-                            if let Some(proteins) = species_go_map.get(go_id) {
-                                proteins_for_go.extend(proteins.iter().cloned());
-                            }
+                let mut aggregated_go_to_proteins: GOTermToProteinSet =
+                    FxHashMap::with_capacity_and_hasher(relevant_go_ids.len(), Default::default());
+                for species_go_map in species_ids
+                    .iter()
+                    .filter_map(|species_id| species_data_by_id.get(species_id))
+                {
+                    for go_id in relevant_go_ids {
+                        if let Some(proteins) = species_go_map.get(go_id) {
+                            aggregated_go_to_proteins
+                                .entry(*go_id)
+                                .or_insert_with(FxHashSet::default)
+                                .extend(proteins.iter().cloned());
                         }
                     }
-                    if !proteins_for_go.is_empty() {
-                        aggregated_go_to_proteins.insert(*go_id, proteins_for_go);
-                    }
                 }
                 aggregated_go_to_proteins
             }
@@ -183,7 +347,53 @@ fn wrap_text(
     text: &str, 
     width: usize
 ) -> String {
-    wrap(text, width).join("<br>")
+    let mut wrapped = String::with_capacity(text.len() + 16);
+    for (index, line) in wrap(text, width).iter().enumerate() {
+        if index > 0 {
+            wrapped.push_str("<br>");
+        }
+        wrapped.push_str(line);
+    }
+    wrapped
+}
+
+fn format_hover_text(
+    name: &str,
+    go_id: GOTermID,
+    lor: f64,
+    minus_log10_p: f64
+) -> String {
+    format!(
+        "<b>Term Name:</b> {}<br><b>Term ID:</b> GO:{:07}<br><b>log(Odds Ratio):</b> {:.3}<br><b>-log10(Stat. Sig.):</b> {:.3}",
+        name, go_id, lor, minus_log10_p
+    )
+}
+
+const MIN_MARKER_SIZE: f64 = 10.0;
+const MID_MARKER_SIZE: f64 = 13.0;
+const MAX_MARKER_SIZE: f64 = 35.0;
+
+fn scale_marker_sizes(size_statistics: &[usize]) -> (Vec<usize>, usize, usize) {
+    let (min_stat, max_stat) = match size_statistics.iter().copied().fold(None, |range, stat| match range {
+        None => Some((stat, stat)),
+        Some((lo, hi)) => Some((usize::min(lo, stat), usize::max(hi, stat))),
+    }) {
+        Some(range) => range,
+        None => return (Vec::new(), 0, 0),
+    };
+
+    let marker_sizes = if max_stat == min_stat {
+        let size = (MIN_MARKER_SIZE + (MAX_MARKER_SIZE - MIN_MARKER_SIZE) / 2.0).round() as usize;
+        vec![size; size_statistics.len()]
+    } else {
+        let scale = (MAX_MARKER_SIZE - MIN_MARKER_SIZE) / (max_stat - min_stat) as f64;
+        size_statistics
+            .iter()
+            .map(|&stat| (MIN_MARKER_SIZE + (stat - min_stat) as f64 * scale).round() as usize)
+            .collect()
+    };
+
+    (marker_sizes, min_stat, max_stat)
 }
 
 fn create_size_legend_trace(
@@ -227,45 +437,38 @@ fn create_edge_width_legend_trace(
 }
 
 
-fn get_namespace_subdir(namespace: &NameSpace, plots_dir: &PathBuf) -> Result<PathBuf, Box<dyn Error + Send + Sync>> {
-    let namespace_str: String = match namespace {
-        NameSpace::BiologicalProcess => "Biological_Process".to_string(),
-        NameSpace::MolecularFunction => "Molecular_Function".to_string(),
-        NameSpace::CellularComponent => "Cellular_Component".to_string(),
+fn get_namespace_subdir(namespace: NameSpace, plots_dir: &PathBuf) -> Result<PathBuf, Box<dyn Error + Send + Sync>> {
+    let namespace_str: &'static str = match namespace {
+        NameSpace::BiologicalProcess => "Biological_Process",
+        NameSpace::MolecularFunction => "Molecular_Function",
+        NameSpace::CellularComponent => "Cellular_Component",
     };
-    let namespace_subdir: PathBuf = plots_dir.join(&namespace_str);
+    let namespace_subdir: PathBuf = plots_dir.join(namespace_str);
     fs::create_dir_all(&namespace_subdir)?;
     Ok(namespace_subdir)
 }
 
 pub fn process_species_data(
     mut significant_species_results: FxHashMap<TaxonID, FxHashMap<GOTermID, GOTermResults>>,
-    study_pop: &StudyPop,
     taxon_id_to_name: &FxHashMap<TaxonID, String>,
 ) -> (
     FxHashMap<String, FxHashMap<GOTermID, GOTermResults>>,
-    FxHashMap<String, FxHashMap<GOTermID, FxHashSet<Protein>>>,
+    FxHashMap<String, TaxonID>,
 ) {
 
     let capacity = significant_species_results.len();
     let mut significant_results_by_name: FxHashMap<String, FxHashMap<GOTermID, GOTermResults>> =
         FxHashMap::with_capacity_and_hasher(capacity, Default::default());
-
-    let original_go_term_to_protein_set = &study_pop.go_term_to_protein_set;
-    let mut new_go_term_to_protein_set: FxHashMap<String, FxHashMap<GOTermID, FxHashSet<Protein>>> =
-        FxHashMap::with_capacity_and_hasher(original_go_term_to_protein_set.len(), Default::default());
+    let mut species_name_to_id: FxHashMap<String, TaxonID> =
+        FxHashMap::with_capacity_and_hasher(capacity, Default::default());
 
     for (taxon_u32_id, go_term_map_value) in significant_species_results.drain() {
         let taxon_name = taxon_id_to_name.get(&taxon_u32_id).unwrap();
         significant_results_by_name.insert(taxon_name.clone(), go_term_map_value);
+        species_name_to_id.insert(taxon_name.clone(), taxon_u32_id);
     }
 
-    for (taxon_u32_id, go_term_data_for_taxon) in original_go_term_to_protein_set.iter() {
-        let taxon_name = taxon_id_to_name.get(taxon_u32_id).unwrap();
-        new_go_term_to_protein_set.insert(taxon_name.clone(), go_term_data_for_taxon.clone());
-    }
-
-    (significant_results_by_name, new_go_term_to_protein_set)
+    (significant_results_by_name, species_name_to_id)
 }
 
 pub fn prepare_plot_data<R>(
@@ -275,6 +478,20 @@ pub fn prepare_plot_data<R>(
 where
     R: EnrichmentResult + Clone + Send + Sync
 {
+    let unique_go_ids: FxHashSet<GOTermID> = significant_results
+        .values()
+        .flat_map(|go_term_results_map| go_term_results_map.keys().copied())
+        .collect();
+
+    let wrapped_names: FxHashMap<GOTermID, String> = unique_go_ids
+        .into_par_iter()
+        .filter_map(|go_id| {
+            ontology
+                .get(&go_id)
+                .map(|obo_term| (go_id, wrap_text(&obo_term.name, 30)))
+        })
+        .collect();
+
     significant_results
         .par_iter()
         .filter_map(|(species_name, go_term_results_map)| {
@@ -286,29 +503,26 @@ where
                     let current_lor = results.log_odds_ratio();
 
                     let minus_log_10_p = if current_p_value > 0.0 {-current_p_value.log10()} else {0.0};
-                    let go_id_string = format!("GO:{:07}", go_id);
-                    let original_name = obo_term.name.clone();
-                    let wrapped_display_name = wrap_text(&original_name, 30);
+                    let original_name = &obo_term.name;
+                    let wrapped_display_name = wrapped_names[go_id].clone();
                     let size_stat = results.size();
-                    let term_namespace = obo_term.namespace.clone();
+                    let term_namespace = obo_term.namespace;
 
-                    let hover_html_content = format!(
-                        "<b>Term Name:</b> {}<br><b>Term ID:</b> {}<br><b>log(Odds Ratio):</b> {:.3}<br><b>-log10(Stat. Sig.):</b> {:.3}",
+                    let hover_html_content = format_hover_text(
                         original_name,
-                        go_id_string,
+                        *go_id,
                         current_lor,
                         minus_log_10_p,
                     );
 
                     let rich_term = GOTermPlotData {
                         go_id: *go_id,
-                        name: original_name,
                         wrapped_name: wrapped_display_name,
-                        lor: current_lor,
+                        lor: current_lor as f32,
                         stat_sig: current_p_value,
-                        minus_log10_p_value: minus_log_10_p,
+                        minus_log10_p_value: minus_log_10_p as f32,
                         size_statistic: size_stat,
-                        namespace: term_namespace.clone(),
+                        namespace: term_namespace,
                         hover_text: hover_html_content,
                     };
 
@@ -319,11 +533,10 @@ where
                 }
             }
 
-            for terms_vec in terms_by_namespace.values_mut() {
-                terms_vec.sort_by(|a, b| {
-                    a.stat_sig.partial_cmp(&b.stat_sig).unwrap_or(Equal)
-                });
+            if terms_by_namespace.is_empty() {
+                return None;
             }
+
             Some((species_name.clone(), terms_by_namespace))
         })
         .collect()
@@ -335,486 +548,337 @@ pub fn bar_plot(
     plot_type: PlotType
 ) -> Result<(), Box<dyn Error + Send + Sync>> {
 
-    plot_data_map
-        .into_iter()
-        .flat_map(|(taxon_name, namespace_map)| {
-            namespace_map
-                .into_iter()
-                .map(move |(namespace, current_plot_data)| {
-                    (taxon_name.clone(), namespace, current_plot_data)
-                })
-        })
-        .par_bridge()
-        .try_for_each(|(taxon_name, namespace, namespace_plot_data)| -> Result<(), Box<dyn Error + Send + Sync>> {
-
-            let namespace_subdir=  get_namespace_subdir(namespace, plots_dir)?;
-            let mut top_20_terms: Vec<GOTermPlotData> = namespace_plot_data
-                .iter()
-                .take(20)
-                .cloned()
-                .collect();
-            
-            top_20_terms.sort_by(|a, b| {
-                a.lor.partial_cmp(&b.lor).unwrap_or(Equal)
-            });
+    PLOT_EXPORT_POOL.install(|| {
+        plot_data_map
+            .into_iter()
+            .flat_map(|(taxon_name, namespace_map)| {
+                namespace_map
+                    .into_iter()
+                    .map(move |(namespace, current_plot_data)| {
+                        (taxon_name, namespace, current_plot_data)
+                    })
+            })
+            .collect::<Vec<_>>()
+            .into_par_iter()
+            .try_for_each(|(taxon_name, namespace, namespace_plot_data)| -> Result<(), Box<dyn Error + Send + Sync>> {
+
+                let namespace_subdir=  get_namespace_subdir(*namespace, plots_dir)?;
+                let mut top_20_terms: Vec<&GOTermPlotData> = namespace_plot_data
+                    .iter()
+                    .collect();
+
+                if top_20_terms.len() > 20 {
+                    top_20_terms.select_nth_unstable_by(19, |a, b| {
+                        a.stat_sig.partial_cmp(&b.stat_sig).unwrap_or(Equal)
+                    });
+                    top_20_terms.truncate(20);
+                }
             
-            let capacity = top_20_terms.len();
-            let mut term_names_display: Vec<String> = Vec::with_capacity(capacity);
-            let mut log_odds_ratios_values: Vec<f64> = Vec::with_capacity(capacity);
-            let mut minus_log_10_stat_sigs_for_color: Vec<f64> = Vec::with_capacity(capacity);
-            let mut html_hover_texts_vec: Vec<String> = Vec::with_capacity(capacity);
-
-            for term_data in top_20_terms {
-                term_names_display.push(term_data.wrapped_name.clone());
-                log_odds_ratios_values.push(term_data.lor);
-                minus_log_10_stat_sigs_for_color.push(term_data.minus_log10_p_value);
-                html_hover_texts_vec.push(term_data.hover_text.clone());
-            }
-
-            let color_bar = ColorBar::new()
-                .title(
-                    Title::from("-log10(Stat. Sig.)")
-                        .side(Side::Right)
-                        .font(Font::new().size(12)),
-                )
-                .tick_font(Font::new().size(10))
-                .len_mode(ThicknessMode::Pixels)
-                .len(150)
-                .thickness(15)
-                .x(1.0)
-                .y(0.9)
-                .y_anchor(Anchor::Middle);
-
-            let marker = Marker::new()
-                .color_array(minus_log_10_stat_sigs_for_color)
-                .color_scale(ColorScale::Palette(ColorScalePalette::Cividis))
-                .color_bar(color_bar)
-                .show_scale(true);
-
-            let bar_trace = Bar::new(log_odds_ratios_values, term_names_display)
-                .orientation(Orientation::Horizontal)
-                .marker(marker)
-                .hover_text_array(html_hover_texts_vec)
-                .hover_info(HoverInfo::Text)
-                .show_legend(false);
-
-            let mut plot = Plot::new();
-            plot.add_trace(bar_trace);
-
-            let layout = Layout::new()
-                .width(460)
-                .height(920)
-                .margin(Margin::new()
-                    .left(50)
-                    .right(0)
-                    .top(30)
-                    .bottom(0))
-                .x_axis(
-                    Axis::new()
-                        .title(Title::with_text("log(Odds Ratio)").font(Font::new().size(12)))
-                        .tick_font(Font::new().size(10))
-                        .show_line(true)
-                        .line_color(NamedColor::Black)
-                        .show_grid(true)
-                        .grid_color(Rgba::new(0, 0, 0, 0.05))
-                        .show_tick_labels(true)
-                        .auto_margin(true),
-                )
-                .y_axis(
-                    Axis::new() 
-                        .title(Title::with_text(""))
-                        .tick_font(Font::new().size(12))
-                        .show_line(true)
-                        .line_color(NamedColor::Black)
-                        .show_grid(true)
-                        .grid_color(Rgba::new(0, 0, 0, 0.05))
-                        .show_tick_labels(true)
-                        .auto_margin(true),
-                )
-                .drag_mode(DragMode::False)
-                .bar_gap(0.4);
-            plot.set_layout(layout);
+                top_20_terms.sort_by(|a, b| {
+                    a.lor.partial_cmp(&b.lor).unwrap_or(Equal)
+                });
             
-            match plot_type {
-                PlotType::Interactive => {
-                    let html_file = namespace_subdir.join(format!("{}_bar_plot.html", sanitize_filename(&taxon_name)));
-                    plot.write_html(html_file); 
-                }
-                PlotType::Static => {
-                    let svg_file = namespace_subdir.join(format!("{}_bar_plot.svg", taxon_name));
-                    plot.write_image(svg_file, ImageFormat::PDF, 940, 460, 1.0);
-                }
-                PlotType::Both => {
-                    let html_file = namespace_subdir.join(format!("{}_bar_plot.html", sanitize_filename(&taxon_name)));
-                    plot.write_html(html_file); 
-
-                    let svg_file = namespace_subdir.join(format!("{}_bar_plot.svg", taxon_name));
-                    plot.write_image(svg_file, ImageFormat::PDF, 940, 460, 1.0);
+                let capacity = top_20_terms.len();
+                let mut term_names_display: Vec<String> = Vec::with_capacity(capacity);
+                let mut log_odds_ratios_values: Vec<f32> = Vec::with_capacity(capacity);
+                let mut minus_log_10_stat_sigs_for_color: Vec<f64> = Vec::with_capacity(capacity);
+                let mut html_hover_texts_vec: Vec<&str> = Vec::with_capacity(capacity);
+
+                for term_data in top_20_terms {
+                    term_names_display.push(term_data.wrapped_name.clone());
+                    log_odds_ratios_values.push(term_data.lor);
+                    minus_log_10_stat_sigs_for_color.push(term_data.minus_log10_p_value as f64);
+                    html_hover_texts_vec.push(&term_data.hover_text);
                 }
-                PlotType::None => {}
 
-            }                                
-            Ok(())
-        })?; 
+                let marker = Marker::new()
+                    .color_array(minus_log_10_stat_sigs_for_color)
+                    .color_scale(ColorScale::Palette(ColorScalePalette::Cividis))
+                    .color_bar(BAR_PLOT_COLOR_BAR.clone())
+                    .show_scale(true);
+
+                let bar_trace = Bar::new(log_odds_ratios_values, term_names_display)
+                    .orientation(Orientation::Horizontal)
+                    .marker(marker)
+                    .hover_text_array(html_hover_texts_vec)
+                    .hover_info(HoverInfo::Text)
+                    .show_legend(false);
+
+                let mut plot = Plot::new();
+                plot.add_trace(bar_trace);
+                plot.set_layout(BAR_PLOT_LAYOUT.clone());
+            
+                save_plot(&plot, &namespace_subdir, taxon_name, "bar_plot", ImageFormat::PDF, plot_type);
+                Ok(())
+            })
+    })?;
 
     Ok(())
 }
 
 pub fn bubble_plot(
-    plot_data_map: FxHashMap<String, FxHashMap<NameSpace, Vec<GOTermPlotData>>>,
+    plot_data_map: &FxHashMap<String, FxHashMap<NameSpace, Vec<GOTermPlotData>>>,
     plots_dir: &PathBuf,
     plot_type: PlotType
 ) -> Result<(), Box<dyn Error + Send + Sync>> {
-    plot_data_map
-        .into_iter()
-        .flat_map(|(taxon_name, namespace_map)| {
-            namespace_map
-                .into_iter()
-                .map(move |(namespace, current_plot_data)| {
-                    (taxon_name.clone(), namespace, current_plot_data)
-                })
-        })
-        .par_bridge()
-        .try_for_each(|(taxon_name, namespace, namespace_plot_data)| -> Result<(), Box<dyn Error + Send + Sync>> {
-            let namespace_subdir = get_namespace_subdir(&namespace, plots_dir)?;
-
-            let enrichment_values: Vec<f64> = namespace_plot_data.iter().map(|t| t.lor).collect();
-            let stat_sig_values: Vec<f64> = namespace_plot_data.iter().map(|t| t.minus_log10_p_value).collect();
-            let hover_texts: Vec<String> = namespace_plot_data.iter().map(|t| t.hover_text.clone()).collect();
-            let size_statistics: Vec<usize> = namespace_plot_data.iter().map(|t| t.size_statistic).collect();
-
-            let min_bubble_size: f64 = 10.0;
-            let mid_bubble_size: f64 = 13.0;
-            let max_bubble_size: f64 = 35.0;
+    PLOT_EXPORT_POOL.install(|| {
+        plot_data_map
+            .into_iter()
+            .flat_map(|(taxon_name, namespace_map)| {
+                namespace_map
+                    .into_iter()
+                    .map(move |(namespace, current_plot_data)| {
+                        (taxon_name, namespace, current_plot_data)
+                    })
+            })
+            .collect::<Vec<_>>()
+            .into_par_iter()
+            .try_for_each(|(taxon_name, namespace, namespace_plot_data)| -> Result<(), Box<dyn Error + Send + Sync>> {
+                let namespace_subdir = get_namespace_subdir(*namespace, plots_dir)?;
+
+                let capacity = namespace_plot_data.len();
+                let mut enrichment_values: Vec<f32> = Vec::with_capacity(capacity);
+                let mut stat_sig_values: Vec<f32> = Vec::with_capacity(capacity);
+                let mut hover_texts: Vec<&str> = Vec::with_capacity(capacity);
+                let mut size_statistics: Vec<usize> = Vec::with_capacity(capacity);
+
+                for term_data in namespace_plot_data {
+                    enrichment_values.push(term_data.lor);
+                    stat_sig_values.push(term_data.minus_log10_p_value);
+                    hover_texts.push(&term_data.hover_text);
+                    size_statistics.push(term_data.size_statistic);
+                }
 
-            let min_stat: f64 = *size_statistics.iter().min().unwrap() as f64;
-            let max_stat: f64 = *size_statistics.iter().max().unwrap() as f64;
+                let (bubble_sizes, _, _) = scale_marker_sizes(&size_statistics);
 
-            let bubble_sizes: Vec<usize> = size_statistics
-                .iter()
-                .map(|&stat| {
-                    let scaled_size_f64 = if max_stat == min_stat {
-                        min_bubble_size + (max_bubble_size - min_bubble_size) / 2.0
-                    } else {
-                        let normalized_size = (stat as f64 - min_stat) / (max_stat - min_stat);
-                        min_bubble_size + (normalized_size * (max_bubble_size - min_bubble_size))
-                    };
-                    scaled_size_f64.round() as usize
-                })
-                .collect();
+                let go_term_size_group_name = "GO Term size";
+                let min_size_legend = create_size_legend_trace(
+                    format!("{}", MIN_MARKER_SIZE),
+                    MIN_MARKER_SIZE as usize,
+                    go_term_size_group_name,
+                    Some("GO Term size".to_owned()),
+                );
+                let mid_size_legend = create_size_legend_trace(
+                    format!("{}", MID_MARKER_SIZE),
+                    MID_MARKER_SIZE as usize,
+                    go_term_size_group_name,
+                    None,
+                );
+                let max_size_legend = create_size_legend_trace(
+                    format!("{}", MAX_MARKER_SIZE),
+                    MAX_MARKER_SIZE as usize,
+                    go_term_size_group_name,
+                    None,
+                );
 
-            let mut plot = Plot::new();
-            let go_term_size_group_name = "GO Term size";
+                let scatter_trace: Box<dyn Trace> = Scatter::new(enrichment_values, stat_sig_values)
+                    .web_gl_mode(plot_type == PlotType::Interactive)
+                    .mode(Mode::Markers)
+                    .marker(
+                        plotly::common::Marker::new()
+                            .color(Rgb::new(156, 148, 120))
+                            .size_array(bubble_sizes)
+                            .opacity(0.9),
+                    )
+                    .hover_text_array(hover_texts)
+                    .hover_info(HoverInfo::Text)
+                    .show_legend(false);
             
-            plot.add_trace(create_size_legend_trace(
-                format!("{}", min_bubble_size),
-                min_bubble_size as usize,
-                go_term_size_group_name,
-                Some("GO Term size".to_owned()),
-            ));
-            plot.add_trace(create_size_legend_trace(
-                format!("{}", mid_bubble_size),
-                mid_bubble_size as usize,
-                go_term_size_group_name,
-                None,
-            ));
-            plot.add_trace(create_size_legend_trace(
-                format!("{}", max_bubble_size),
-                max_bubble_size as usize,
-                go_term_size_group_name,
-                None,
-            ));
-
-            let scatter_trace = Scatter::new(enrichment_values, stat_sig_values)
-                .mode(Mode::Markers)
-                .marker(
-                    plotly::common::Marker::new()
-                        .color(Rgb::new(156, 148, 120))
-                        .size_array(bubble_sizes)
-                        .opacity(0.9),
-                )
-                .hover_text_array(hover_texts)
-                .hover_info(HoverInfo::Text)
-                .show_legend(false);
-            
-            plot.add_trace(scatter_trace);
-            let mut terms_for_sorting = namespace_plot_data.clone();
-            terms_for_sorting.sort_by(|a, b| {
-                b.minus_log10_p_value
-                    .partial_cmp(&a.minus_log10_p_value)
-                    .unwrap_or(std::cmp::Ordering::Equal)
-            });
-
-            let mut top_10_significant_terms: Vec<GOTermPlotData> = terms_for_sorting
-                .iter()
-                .take(10)
-                .cloned()
-                .collect();
-
-            top_10_significant_terms.sort_by(|a, b| {
-                a.lor.partial_cmp(&b.lor)
-                    .unwrap_or(Equal)
-            });
+                let mut plot = Plot::new();
+                plot.add_traces(vec![min_size_legend, mid_size_legend, max_size_legend, scatter_trace]);
+
+                let mut top_10_significant_terms: Vec<&GOTermPlotData> = namespace_plot_data
+                    .iter()
+                    .collect();
+                if top_10_significant_terms.len() > 10 {
+                    top_10_significant_terms.select_nth_unstable_by(9, |a, b| {
+                        b.minus_log10_p_value
+                            .partial_cmp(&a.minus_log10_p_value)
+                            .unwrap_or(Equal)
+                    });
+                    top_10_significant_terms.truncate(10);
+                }
 
-            let mut annotations: Vec<Annotation> = Vec::new();
-            let text_positions_cycle = vec![
-                (-30, 20),  // top left
-                (30, 10),   // top right
-                (-30, -20), // bottom left
-                (30, -10),  // bottom right
-            ];
-
-            for (i, term) in top_10_significant_terms.iter().enumerate() {
-                let (ax_offset, ay_offset) = text_positions_cycle[i % text_positions_cycle.len()];
-                annotations.push(
-                    Annotation::new()
-                        .x(term.lor)
-                        .y(term.minus_log10_p_value)
-                        .text(format!("GO:{:07}", term.go_id))
-                        .show_arrow(true)
-                        .font(
-                            Font::new()
-                                .size(10)
-                                .color(NamedColor::Black
-                            ))
-                        .arrow_head(2)
-                        .arrow_size(1.0)
-                        .arrow_width(1.1)
-                        .arrow_color(NamedColor::Black)
-                        .ax(ax_offset)
-                        .ay(ay_offset)
-                        .opacity(0.9)
-                );
-            }
+                top_10_significant_terms.sort_by(|a, b| {
+                    a.lor.partial_cmp(&b.lor)
+                        .unwrap_or(Equal)
+                });
 
-            let layout = Layout::new()
-                .width(940)
-                .height(460)
-                .margin(Margin::new()
-                    .left(50)
-                    .right(0)
-                    .top(30)
-                    .bottom(15))
-                .x_axis(
-                    Axis::new()
-                        .title(Title::with_text("log(Odds Ratio)").font(Font::new().size(12)))
-                        .tick_font(Font::new().size(10))
-                        .show_line(true)
-                        .line_color(NamedColor::Black)
-                        .show_grid(true)
-                        .grid_color(Rgba::new(0, 0, 0, 0.05))
-                        .show_tick_labels(true)
-                        .auto_margin(true)
-                        .range_mode(RangeMode::ToZero),
-                )
-                .y_axis(
-                    Axis::new()
-                        .title(Title::with_text("-log10(Stat. Sig.)").font(Font::new().size(12)))
-                        .tick_font(Font::new().size(10))
-                        .show_line(true)
-                        .line_color(NamedColor::Black)
-                        .show_grid(true)
-                        .grid_color(Rgba::new(0, 0, 0, 0.05))
-                        .show_tick_labels(true)
-                        .auto_margin(true)
-                        .range_mode(RangeMode::ToZero),
-                )
-                .legend(
-                    Legend::new()
-                        .x(1.0)
-                        .y(1.0)
-                        .trace_group_gap(10)
-                        .trace_order(TraceOrder::Grouped) 
-                        .item_click(ItemClick::False)
-                        .item_double_click(ItemClick::False)
-                )
-                .annotations(annotations);
-
-            plot.set_layout(layout);
-
-            match plot_type {
-                PlotType::Interactive => {
-                    let html_file = namespace_subdir.join(format!("{}_bubble_plot.html", sanitize_filename(&taxon_name)));
-                    plot.write_html(html_file); 
-                }
-                PlotType::Static => {
-                    let svg_file = namespace_subdir.join(format!("{}_bubble_plot.svg", taxon_name));
-                    plot.write_image(svg_file, ImageFormat::SVG, 940, 460, 1.0);
-                }
-                PlotType::Both => {
-                    let html_file = namespace_subdir.join(format!("{}_bubble_plot.html", sanitize_filename(&taxon_name)));
-                    plot.write_html(html_file); 
+                const TEXT_POSITIONS_CYCLE: [(i32, i32); 4] = [
+                    (-30, 20),  // top left
+                    (30, 10),   // top right
+                    (-30, -20), // bottom left
+                    (30, -10),  // bottom right
+                ];
+
+                let annotations: Vec<Annotation> = top_10_significant_terms
+                    .iter()
+                    .zip(TEXT_POSITIONS_CYCLE.iter().cycle())
+                    .map(|(term, &(ax_offset, ay_offset))| {
+                        Annotation::new()
+                            .x(term.lor as f64)
+                            .y(term.minus_log10_p_value as f64)
+                            .text(format!("GO:{:07}", term.go_id))
+                            .show_arrow(true)
+                            .font(
+                                Font::new()
+                                    .size(10)
+                                    .color(NamedColor::Black
+                                ))
+                            .arrow_head(2)
+                            .arrow_size(1.0)
+                            .arrow_width(1.1)
+                            .arrow_color(NamedColor::Black)
+                            .ax(ax_offset)
+                            .ay(ay_offset)
+                            .opacity(0.9)
+                    })
+                    .collect();
 
-                    let svg_file = namespace_subdir.join(format!("{}_bubble_plot.svg", taxon_name));
-                    plot.write_image(svg_file, ImageFormat::SVG, 940, 460, 1.0);
-                }
-                PlotType::None => {}
+                plot.set_layout(BUBBLE_PLOT_LAYOUT.clone().annotations(annotations));
 
-            }  
+                save_plot(&plot, &namespace_subdir, taxon_name, "bubble_plot", ImageFormat::SVG, plot_type);
 
-            Ok(())
-        })?;
+                Ok(())
+            })
+    })?;
 
     Ok(())
 }
 
-pub fn prepare_network_data<R>(
-    significant_results: &FxHashMap<String, FxHashMap<GOTermID, R>>,
+pub fn prepare_network_data(
+    plot_data_map: &FxHashMap<String, FxHashMap<NameSpace, Vec<GOTermPlotData>>>,
     protein_provider: &ProteinDataProvider,
-    ontology: &OboMap,
-) -> FxHashMap<String, FxHashMap<NameSpace, GOTermToProteinSet>>
-where
-    R: EnrichmentResult + Clone + Send + Sync, 
-{
-    significant_results
+) -> FxHashMap<String, FxHashMap<NameSpace, GOTermToProteinSet>> {
+    plot_data_map
         .par_iter() 
-        .map(|(taxon_name, enriched_go_terms_map)| {
-            let relevant_go_ids_for_taxon: FxHashSet<GOTermID> = enriched_go_terms_map.keys().cloned().collect();
-            let current_taxon_go_to_proteins = protein_provider
+        .map(|(taxon_name, taxon_plot_data)| {
+            let relevant_go_ids_for_taxon: FxHashSet<GOTermID> = taxon_plot_data
+                .values()
+                .flatten()
+                .map(|term_data| term_data.go_id)
+                .collect();
+            let mut current_taxon_go_to_proteins = protein_provider
                 .get_proteins_for_taxon(taxon_name, &relevant_go_ids_for_taxon);
 
-            let network_data_by_namespace = enriched_go_terms_map
+            let network_data_by_namespace: FxHashMap<NameSpace, GOTermToProteinSet> = taxon_plot_data
                 .iter()
-                .filter_map(|(go_id, _result)| { 
-                    ontology.get(go_id).and_then(|obo_term| { 
-                        let namespace = obo_term.namespace.clone();
-                        current_taxon_go_to_proteins.get(go_id).map(|protein_set_for_go_term| {
-                            (*go_id, namespace, protein_set_for_go_term.clone())
+                .filter_map(|(namespace, namespace_plot_data)| {
+                    let go_term_to_proteins: GOTermToProteinSet = namespace_plot_data
+                        .iter()
+                        .filter_map(|term_data| {
+                            current_taxon_go_to_proteins
+                                .remove(&term_data.go_id)
+                                .map(|protein_set_for_go_term| (term_data.go_id, protein_set_for_go_term))
                         })
-                    })
+                        .collect();
+                    if go_term_to_proteins.is_empty() {
+                        None
+                    } else {
+                        Some((*namespace, go_term_to_proteins))
+                    }
                 })
-                .fold(
-                    FxHashMap::<NameSpace, GOTermToProteinSet>::default(),
-                    |mut acc, (go_id, namespace, protein_set)| {
-                        acc.entry(namespace)
-                           .or_insert_with(FxHashMap::default)
-                           .insert(go_id, protein_set);
-                        acc
-                    },
-                );
+                .collect();
             (taxon_name.clone(), network_data_by_namespace)
         })
         .collect()
 }
 
-pub fn build_networks<R>(
+pub fn build_networks(
     network_data: &FxHashMap<String, FxHashMap<NameSpace, GOTermToProteinSet>>,
-    enrichment_results: &FxHashMap<String, FxHashMap<GOTermID, R>>,
-    ontology: &OboMap,
-) -> FxHashMap<String, FxHashMap<NameSpace, Vec<GoTermNetworkGraph>>> 
-where 
-    R: EnrichmentResult + Clone + Send + Sync
-{
+    plot_data_map: &FxHashMap<String, FxHashMap<NameSpace, Vec<GOTermPlotData>>>,
+) -> FxHashMap<String, FxHashMap<NameSpace, Vec<GoTermNetworkGraph>>> {
     network_data
         .par_iter()
         .filter_map(|(taxon_name, taxon_specific_network_data)| {
-            enrichment_results
+            plot_data_map
                 .get(taxon_name)
-                .map(|taxon_specific_enrichment_results| {
-                    let mut taxon_networks_graphs: FxHashMap<NameSpace, Vec<GoTermNetworkGraph>> =
-                        FxHashMap::default();
-
-                    for current_namespace in NameSpace::iter() {
-                        if let Some(proteins) = taxon_specific_network_data.get(&current_namespace) {
-                            let go_term_proteins_in_namespace = proteins;
-                        
-
-                        let mut current_namespace_network: GoTermNetworkGraph = StableGraph::default();
-                        let mut term_to_node_index_map: FxHashMap<GOTermID, NodeIndex> = FxHashMap::default();
-                        let mut term_to_proteins_map_for_nodes: FxHashMap<GOTermID, &FxHashSet<Protein>> = FxHashMap::default();
-
-                        for (go_term_id, protein_set) in go_term_proteins_in_namespace {
-                            if let (Some(enrichment_detail), Some(obo_term)) = (
-                                taxon_specific_enrichment_results.get(go_term_id),
-                                ontology.get(go_term_id)
-                            ) {
-                                let p_value = enrichment_detail.p_value();
-                                let lor = enrichment_detail.log_odds_ratio();
-                                let minus_log10_p = if p_value > 0.0 { -p_value.log10() } else { 0.0 };
-                                let go_id_str = format!("GO:{:07}", go_term_id);
-                                let name = obo_term.name.clone();
-                                let wrapped_name = wrap_text(&name, 30);
-                                let size = enrichment_detail.size();
-
-                                let hover_text = format!(
-                                    "<b>Term Name:</b> {}<br><b>Term ID:</b> {}<br><b>log(Odds Ratio):</b> {:.3}<br><b>-log10(Stat. Sig.):</b> {:.3}",
-                                    name, go_id_str, lor, minus_log10_p
-                                );
-
-                                let node_data = GOTermPlotData {
-                                    go_id: *go_term_id,
-                                    name: name.to_string(),
-                                    wrapped_name,
-                                    lor,
-                                    stat_sig: p_value,
-                                    minus_log10_p_value: minus_log10_p,
-                                    size_statistic: size,
-                                    namespace: obo_term.namespace.clone(), 
-                                    hover_text,
-                                };
-
-                            let node_idx = current_namespace_network.add_node(node_data);
-                            term_to_node_index_map.insert(*go_term_id, node_idx);
-                            term_to_proteins_map_for_nodes.insert(*go_term_id, protein_set);
-                            }
-                        }
-                        
-
-                        let mut protein_to_terms_map: FxHashMap<&Protein, FxHashSet<GOTermID>> = FxHashMap::default();
-                        let mut term_node_sizes: FxHashMap<GOTermID, usize> = FxHashMap::default();
-
-                        for (term_id, protein_set) in &term_to_proteins_map_for_nodes {
-                            term_node_sizes.insert(*term_id, protein_set.len());
-                            for protein in protein_set.iter() {
-                                protein_to_terms_map
-                                    .entry(protein)
-                                    .or_insert_with(FxHashSet::default)
-                                    .insert(*term_id);
-                            }
-                        }
-
-                        let mut candidate_go_pairs: FxHashSet<(GOTermID, GOTermID)> = FxHashSet::default();
-                        for go_terms_sharing_protein in protein_to_terms_map.values() {
-                            if go_terms_sharing_protein.len() >= 2 {
-                                for combo in go_terms_sharing_protein.iter().combinations(2) {
-                                    let term1 = *combo[0];
-                                    let term2 = *combo[1];
-                                    let pair = if term1 < term2 {
-                                        (term1, term2)
-                                    } else {
-                                        (term2, term1)
-                                    };
-                                    candidate_go_pairs.insert(pair);
+                .map(|taxon_specific_plot_data| {
+                    let taxon_networks_graphs: FxHashMap<NameSpace, Vec<GoTermNetworkGraph>> =
+                        taxon_specific_network_data
+                            .par_iter()
+                            .filter_map(|(current_namespace, go_term_proteins_in_namespace)| {
+                                let namespace_plot_data = taxon_specific_plot_data.get(current_namespace)?;
+
+                                let plot_data_by_term: FxHashMap<GOTermID, &GOTermPlotData> = namespace_plot_data
+                                    .iter()
+                                    .map(|term_data| (term_data.go_id, term_data))
+                                    .collect();
+
+                                let mut current_namespace_network: GoTermNetworkGraph = StableGraph::default();
+                                let mut term_node_indices: Vec<NodeIndex> = Vec::with_capacity(go_term_proteins_in_namespace.len());
+                                let mut term_protein_sets: Vec<&FxHashSet<Protein>> = Vec::with_capacity(go_term_proteins_in_namespace.len());
+
+                                for (go_term_id, protein_set) in go_term_proteins_in_namespace {
+                                    if let Some(&node_data) = plot_data_by_term.get(go_term_id) {
+                                        term_node_indices.push(current_namespace_network.add_node(GOTermNodeData {
+                                            go_id: node_data.go_id,
+                                            lor: node_data.lor,
+                                            size_statistic: node_data.size_statistic,
+                                            hover_text: node_data.hover_text.clone(),
+                                        }));
+                                        term_protein_sets.push(protein_set);
+                                    }
                                 }
-                            }
-                        }
 
-                        for (term1_id, term2_id) in candidate_go_pairs {
-                            let size1 = *term_node_sizes.get(&term1_id).unwrap();
-                            let size2 = *term_node_sizes.get(&term2_id).unwrap();
+                                let mut protein_ids: FxHashMap<&Protein, u32> = FxHashMap::default();
+                                let mut protein_term_pairs: Vec<(u32, u32)> = Vec::new();
+                                for (term_idx, protein_set) in term_protein_sets.iter().enumerate() {
+                                    for protein in protein_set.iter() {
+                                        let next_protein_id = protein_ids.len() as u32;
+                                        let protein_id = *protein_ids.entry(protein).or_insert(next_protein_id);
+                                        protein_term_pairs.push((protein_id, term_idx as u32));
+                                    }
+                                }
 
-                            let proteins1 = term_to_proteins_map_for_nodes.get(&term1_id).unwrap();
-                            let proteins2 = term_to_proteins_map_for_nodes.get(&term2_id).unwrap();
+                                let mut protein_term_offsets: Vec<usize> = vec![0; protein_ids.len() + 1];
+                                for &(protein_id, _) in &protein_term_pairs {
+                                    protein_term_offsets[protein_id as usize + 1] += 1;
+                                }
+                                for i in 1..protein_term_offsets.len() {
+                                    protein_term_offsets[i] += protein_term_offsets[i - 1];
+                                }
 
-                            let intersection_size = proteins1.intersection(proteins2).count();
-                            let union_size = size1 + size2 - intersection_size;
+                                let mut protein_terms: Vec<u32> = vec![0; protein_term_pairs.len()];
+                                let mut next_slot = protein_term_offsets.clone();
+                                for (protein_id, term_idx) in protein_term_pairs {
+                                    let slot = &mut next_slot[protein_id as usize];
+                                    protein_terms[*slot] = term_idx;
+                                    *slot += 1;
+                                }
 
-                            let jaccard_similarity: JaccardIndex =
-                                (intersection_size as f32) / (union_size as f32);
+                                let mut shared_protein_counts: FxHashMap<(u32, u32), u32> = FxHashMap::default();
+                                for offsets in protein_term_offsets.windows(2) {
+                                    let term_indices = &protein_terms[offsets[0]..offsets[1]];
+                                    for (pos, &term1_idx) in term_indices.iter().enumerate() {
+                                        for &term2_idx in &term_indices[pos + 1..] {
+                                            *shared_protein_counts.entry((term1_idx, term2_idx)).or_insert(0) += 1;
+                                        }
+                                    }
+                                }
 
-                            if jaccard_similarity >= 0.25 {
-                                let &node_idx1= term_to_node_index_map.get(&term1_id).unwrap();
-                                let &node_idx2= term_to_node_index_map.get(&term2_id).unwrap();
-                                
-                                current_namespace_network.add_edge(node_idx1, node_idx2, jaccard_similarity);
-                            }
+                                for ((term1_idx, term2_idx), intersection_size) in shared_protein_counts {
+                                    let intersection_size = intersection_size as usize;
+                                    let union_size = term_protein_sets[term1_idx as usize].len()
+                                        + term_protein_sets[term2_idx as usize].len()
+                                        - intersection_size;
+
+                                    let jaccard_similarity: JaccardIndex =
+                                        (intersection_size as f32) / (union_size as f32);
+
+                                    if jaccard_similarity >= 0.25 {
+                                        current_namespace_network.add_edge(
+                                            term_node_indices[term1_idx as usize],
+                                            term_node_indices[term2_idx as usize],
+                                            jaccard_similarity
+                                        );
+                                    }
+                                }
 
-                        }
-                        
-                        let top_k_subgraphs = extract_top_k_communities(&current_namespace_network, 4);
-                        taxon_networks_graphs.insert(current_namespace.clone(), top_k_subgraphs);
-                    }
-                }
+                                let top_k_subgraphs = extract_top_k_communities(&current_namespace_network, 4);
+                                Some((*current_namespace, top_k_subgraphs))
+                            })
+                            .collect();
                     (taxon_name.clone(), taxon_networks_graphs)
                 })
         })
@@ -824,29 +888,27 @@ where
 fn get_all_connected_components(
     graph: &GoTermNetworkGraph,
 ) -> Vec<Vec<NodeIndex>> {
-    let mut visited_nodes = FxHashSet::default();
+    let mut visited_nodes = vec![false; graph.node_bound()];
     let mut all_components = Vec::new();
 
     for node_idx in graph.node_indices() {
-        if !visited_nodes.contains(&node_idx) {
+        if !visited_nodes[node_idx.index()] {
             let mut current_component_nodes = Vec::new();
             let mut queue = VecDeque::new();
 
             queue.push_back(node_idx);
-            visited_nodes.insert(node_idx);
+            visited_nodes[node_idx.index()] = true;
 
             while let Some(u_idx) = queue.pop_front() {
                 current_component_nodes.push(u_idx);
-                for neighbor_idx in graph.neighbors(u_idx) {
-                    if !visited_nodes.contains(&neighbor_idx) {
-                        visited_nodes.insert(neighbor_idx);
+                for neighbor_idx in graph.neighbors_undirected(u_idx) {
+                    if !visited_nodes[neighbor_idx.index()] {
+                        visited_nodes[neighbor_idx.index()] = true;
                         queue.push_back(neighbor_idx);
                     }
                 }
             }
-            if !current_component_nodes.is_empty() {
-                all_components.push(current_component_nodes);
-            }
+            all_components.push(current_component_nodes);
         }
     }
     all_components
@@ -856,18 +918,17 @@ fn extract_top_k_communities(
     graph: &GoTermNetworkGraph,
     k: usize,
 ) -> Vec<GoTermNetworkGraph> {
-    let mut components_node_indices = get_all_connected_components(graph);
+    let mut components_node_indices: Vec<Vec<NodeIndex>> = get_all_connected_components(graph)
+        .into_iter()
+        .filter(|component_nodes| component_nodes.len() > 1)
+        .collect();
 
     components_node_indices.sort_by_key(|comp| std::cmp::Reverse(comp.len()));
 
     let mut top_k_graphs = Vec::new();
 
     for component_nodes in components_node_indices.into_iter().take(k) {
-        if component_nodes.is_empty() {
-            continue;
-        }
-
-        let mut subgraph: GoTermNetworkGraph = StableGraph::default();
+        let mut subgraph: GoTermNetworkGraph = StableGraph::with_capacity(component_nodes.len(), 0);
         let mut old_to_new_node_map = FxHashMap::default();
 
         for &old_node_idx in &component_nodes {
@@ -877,36 +938,16 @@ fn extract_top_k_communities(
             }
         }
 
-        let component_node_set: FxHashSet<NodeIndex> = component_nodes.iter().cloned().collect();
-
         for &old_u_idx in &component_nodes {
             let new_u_idx = old_to_new_node_map[&old_u_idx];
 
             for edge_ref in graph.edges(old_u_idx) {
-                let old_v_idx = edge_ref.target();
-                if component_node_set.contains(&old_v_idx) {
-                    if old_u_idx <= old_v_idx {
-                        if let Some(&new_v_idx) = old_to_new_node_map.get(&old_v_idx) {
-                            if let Some(edge_weight) = graph.edge_weight(edge_ref.id()) {
-                                subgraph.add_edge(new_u_idx, new_v_idx, *edge_weight);
-                            }
-                        }
-                    }
+                if let Some(&new_v_idx) = old_to_new_node_map.get(&edge_ref.target()) {
+                    subgraph.add_edge(new_u_idx, new_v_idx, *edge_ref.weight());
                 }
             }
         }
 
-        let mut nodes_to_remove = Vec::new();
-        for node_index in subgraph.node_indices() {
-            if subgraph.neighbors_undirected(node_index).count() == 0 { 
-                nodes_to_remove.push(node_index);
-            }
-        }
-
-        for node_index in nodes_to_remove {
-            subgraph.remove_node(node_index);
-        }
-
         top_k_graphs.push(subgraph);
     }
 
@@ -914,16 +955,29 @@ fn extract_top_k_communities(
 }
 
 fn apply_fruchterman_reingold_layout(
-    original_graph: &GoTermNetworkGraph,
+    original_graph: GoTermNetworkGraph,
     iterations: usize,
-) -> ForceGraph<f32, 2, GOTermPlotData, JaccardIndex, Directed> {
+) -> LayoutGraph {
 
     let mut force_layout_graph=
         init_force_graph_uniform(
-            original_graph.clone(),
+            original_graph,
             10.0,
     );
 
+    let node_count = force_layout_graph.node_count();
+    if node_count <= 3 {
+        force_layout_graph
+            .node_weights_mut()
+            .enumerate()
+            .for_each(|(i, (_node_data, location))| {
+                let angle = 2.0 * std::f32::consts::PI * i as f32 / node_count as f32;
+                location.x = 10.0 * angle.cos();
+                location.y = 10.0 * angle.sin();
+            });
+        return force_layout_graph;
+    }
+
     let mut fr_force = FruchtermanReingold {
         conf: FruchtermanReingoldConfiguration {
             dt: 0.02,
@@ -940,435 +994,356 @@ fn apply_fruchterman_reingold_layout(
 }
 
 pub fn network_plot(
-    top_networks_map: &FxHashMap<String, FxHashMap<NameSpace, Vec<GoTermNetworkGraph>>>,
+    top_networks_map: FxHashMap<String, FxHashMap<NameSpace, Vec<GoTermNetworkGraph>>>,
     plots_dir: &PathBuf,
     plot_type: PlotType
 ) -> Result<(), Box<dyn Error + Send + Sync>> {
 
     let mut network_layouts_map: FxHashMap<String, FxHashMap<NameSpace, Vec<LayoutGraph>>> =
         top_networks_map
-            .par_iter() 
+            .into_par_iter() 
             .map(|(taxon_name, namespace_to_networks_map)| {
                 let layouts_for_taxon: FxHashMap<NameSpace, Vec<LayoutGraph>> =
                     namespace_to_networks_map
-                        .iter() 
+                        .into_iter() 
+                        .filter(|(_, networks_vec)| !networks_vec.is_empty())
                         .map(|(namespace, networks_vec)| {
                             let layouts_for_namespace: Vec<LayoutGraph> = networks_vec
-                                .iter()
+                                .into_iter()
                                 .map(|network_graph| {
                                     apply_fruchterman_reingold_layout(network_graph, 5000)
                                 })
                                 .collect();
-                            (*namespace, layouts_for_namespace)
+                            (namespace, layouts_for_namespace)
                         })
                         .collect();
-                (taxon_name.clone(), layouts_for_taxon)
+                (taxon_name, layouts_for_taxon)
             })
             .collect();
 
-    network_layouts_map
-        .par_iter_mut() 
-        .try_for_each(|(taxon_name, namespace_map)| {
-            namespace_map
-                .iter_mut()
-                .try_for_each(|(namespace, layouts_vec)| {
-                    layouts_vec
-                        .iter_mut()
-                        .enumerate()
-                        .for_each(|(i, graph)| {
-                            let (quadrant_min_x, quadrant_min_y) = QUADRANT_DEFINITIONS[i];
-
-                            let padding_abs_x = QUADRANT_WIDTH * 0.1;
-                            let padding_abs_y = QUADRANT_HEIGHT * 0.1;
-
-                            let drawable_origin_x = quadrant_min_x + padding_abs_x;
-                            let drawable_origin_y = quadrant_min_y + padding_abs_y;
-                            let mut drawable_width = QUADRANT_WIDTH - 2.0 * padding_abs_x;
-                            let mut drawable_height = QUADRANT_HEIGHT - 2.0 * padding_abs_y;
-
-                            drawable_width = drawable_width.max(0.0);
-                            drawable_height = drawable_height.max(0.0);
-
-                            let mut min_graph_x = f32::MAX;
-                            let mut max_graph_x = f32::MIN;
-                            let mut min_graph_y = f32::MAX;
-                            let mut max_graph_y = f32::MIN;
-
-                            graph.node_weights().for_each(|(_node_data, location)| {
-                                min_graph_x = min_graph_x.min(location.x);
-                                max_graph_x = max_graph_x.max(location.x);
-                                min_graph_y = min_graph_y.min(location.y);
-                                max_graph_y = max_graph_y.max(location.y);
-                            });
-
-                            let current_graph_width = max_graph_x - min_graph_x;
-                            let current_graph_height = max_graph_y - min_graph_y;
-
-                            let scale_ratio_x = drawable_width / current_graph_width;
-                            let scale_ratio_y = drawable_height / current_graph_height;
-                            let mut scale_factor = scale_ratio_x.min(scale_ratio_y);
-
-                            scale_factor = scale_factor.max(0.0);
-
-                            let scaled_graph_width = current_graph_width * scale_factor;
-                            let scaled_graph_height = current_graph_height * scale_factor;
-
-                            let offset_x_in_drawable = (drawable_width - scaled_graph_width) / 2.0;
-                            let offset_y_in_drawable = (drawable_height - scaled_graph_height) / 2.0;
-
-                            let final_translation_x = drawable_origin_x + offset_x_in_drawable;
-                            let final_translation_y = drawable_origin_y + offset_y_in_drawable;
-
-                            graph.node_weights_mut().for_each(|(_node_data, location)| {
-                                let original_relative_x = location.x - min_graph_x;
-                                let original_relative_y = location.y - min_graph_y;
-
-                                location.x = original_relative_x * scale_factor + final_translation_x;
-                                location.y = original_relative_y * scale_factor + final_translation_y;
-                            });
-                        }); 
+    PLOT_EXPORT_POOL.install(|| {
+        network_layouts_map
+            .par_iter_mut() 
+            .try_for_each(|(taxon_name, namespace_map)| {
+                namespace_map
+                    .iter_mut()
+                    .try_for_each(|(namespace, layouts_vec)| {
+                        layouts_vec
+                            .iter_mut()
+                            .enumerate()
+                            .for_each(|(i, graph)| {
+                                let (quadrant_min_x, quadrant_min_y) = QUADRANT_DEFINITIONS[i];
+
+                                let padding_abs_x = QUADRANT_WIDTH * 0.1;
+                                let padding_abs_y = QUADRANT_HEIGHT * 0.1;
+
+                                let drawable_origin_x = quadrant_min_x + padding_abs_x;
+                                let drawable_origin_y = quadrant_min_y + padding_abs_y;
+                                let mut drawable_width = QUADRANT_WIDTH - 2.0 * padding_abs_x;
+                                let mut drawable_height = QUADRANT_HEIGHT - 2.0 * padding_abs_y;
+
+                                drawable_width = drawable_width.max(0.0);
+                                drawable_height = drawable_height.max(0.0);
+
+                                let mut min_graph_x = f32::MAX;
+                                let mut max_graph_x = f32::MIN;
+                                let mut min_graph_y = f32::MAX;
+                                let mut max_graph_y = f32::MIN;
+
+                                graph.node_weights().for_each(|(_node_data, location)| {
+                                    min_graph_x = min_graph_x.min(location.x);
+                                    max_graph_x = max_graph_x.max(location.x);
+                                    min_graph_y = min_graph_y.min(location.y);
+                                    max_graph_y = max_graph_y.max(location.y);
+                                });
+
+                                let current_graph_width = max_graph_x - min_graph_x;
+                                let current_graph_height = max_graph_y - min_graph_y;
+
+                                let scale_ratio_x = drawable_width / current_graph_width;
+                                let scale_ratio_y = drawable_height / current_graph_height;
+                                let mut scale_factor = scale_ratio_x.min(scale_ratio_y);
+
+                                scale_factor = scale_factor.max(0.0);
+
+                                let scaled_graph_width = current_graph_width * scale_factor;
+                                let scaled_graph_height = current_graph_height * scale_factor;
+
+                                let offset_x_in_drawable = (drawable_width - scaled_graph_width) / 2.0;
+                                let offset_y_in_drawable = (drawable_height - scaled_graph_height) / 2.0;
+
+                                let final_translation_x = drawable_origin_x + offset_x_in_drawable;
+                                let final_translation_y = drawable_origin_y + offset_y_in_drawable;
+
+                                graph.node_weights_mut().for_each(|(_node_data, location)| {
+                                    let original_relative_x = location.x - min_graph_x;
+                                    let original_relative_y = location.y - min_graph_y;
+
+                                    location.x = original_relative_x * scale_factor + final_translation_x;
+                                    location.y = original_relative_y * scale_factor + final_translation_y;
+                                });
+                            }); 
                     
-                    let mut plot = Plot::new();
-                    const MIN_EDGE_WIDTH: f64 = 2.0;
-                    const MAX_EDGE_WIDTH: f64 = 8.0; 
-
-                    let mut all_jaccard_indices_for_this_plot: Vec<JaccardIndex> = Vec::new();
-                    for graph in layouts_vec.iter() {
-                        for edge_ref in graph.edge_references() {
-                            all_jaccard_indices_for_this_plot.push(*edge_ref.weight());
-                        }
-                    }
-
-                    let min_jaccard_opt = all_jaccard_indices_for_this_plot.iter().copied().reduce(f32::min);
-                    let max_jaccard_opt = all_jaccard_indices_for_this_plot.iter().copied().reduce(f32::max);
-
-                    let min_jaccard_value = if let Some(val) = min_jaccard_opt {
-                        val
-                    } else {
-                        0.0 
-                    };
-                    let max_jaccard_value = if let Some(val) = max_jaccard_opt {
-                        val
-                    } else {
-                        0.0 
-                    };
-                    let mid_jaccard_value = (min_jaccard_value + max_jaccard_value) / 2.0;
-                    
-                    let jaccard_group_name = "Jaccard Index";
-                    plot.add_trace(create_edge_width_legend_trace(
-                        format!("{:.3}", min_jaccard_value),
-                        MIN_EDGE_WIDTH,
-                        jaccard_group_name,
-                        Some("Jaccard Index".to_owned())
-                    ));
-
-                    plot.add_trace(create_edge_width_legend_trace(
-                        format!("{:.3}", mid_jaccard_value),
-                        (MIN_EDGE_WIDTH + MAX_EDGE_WIDTH) / 2.0,
-                        jaccard_group_name,
-                        None
-                    ));
-                    plot.add_trace(create_edge_width_legend_trace(
-                        format!("{:.3}", max_jaccard_value),
-                        MAX_EDGE_WIDTH,
-                        jaccard_group_name,
-                        None
-                    ));
-
-                    if let (Some(min_j), Some(max_j)) = (min_jaccard_opt, max_jaccard_opt) {
-                        let min_jaccard = min_j;
-                        let max_jaccard = max_j;
+                        let mut plot = Plot::new();
+                        const MIN_EDGE_WIDTH: f64 = 2.0;
+                        const MAX_EDGE_WIDTH: f64 = 8.0; 
 
+                        let mut all_jaccard_indices_for_this_plot: Vec<JaccardIndex> = Vec::new();
                         for graph in layouts_vec.iter() {
                             for edge_ref in graph.edge_references() {
-                                let jaccard_index_val = *edge_ref.weight();
-                                let source_idx = edge_ref.source();
-                                let target_idx = edge_ref.target();
-
-                                if let (Some(source_node_info), Some(target_node_info)) =
-                                    (graph.node_weight(source_idx), graph.node_weight(target_idx))
-                                {
-                                    let x_start = source_node_info.1.x as f64;
-                                    let y_start = source_node_info.1.y as f64;
-                                    let x_end = target_node_info.1.x as f64;
-                                    let y_end = target_node_info.1.y as f64;
-
-                                    let scaled_width = if max_jaccard <= min_jaccard { 
-                                        MIN_EDGE_WIDTH + (MAX_EDGE_WIDTH - MIN_EDGE_WIDTH) / 2.0
-                                    } else {
-                                        let normalized_val = (jaccard_index_val - min_jaccard) as f64 / (max_jaccard - min_jaccard) as f64;
-                                        MIN_EDGE_WIDTH + normalized_val * (MAX_EDGE_WIDTH - MIN_EDGE_WIDTH)
-                                    };
-                                    let final_edge_width = scaled_width.max(MIN_EDGE_WIDTH).min(MAX_EDGE_WIDTH);
-
-                                    let edge_segment_trace = Scatter::new(vec![x_start, x_end], vec![y_start, y_end])
-                                        .mode(Mode::Lines)
-                                        .line(
-                                            Line::new()
-                                                .width(final_edge_width)
-                                                .color(Rgba::new(200, 200, 200, 0.5))
-                                                
-                                        )
-                                        .show_legend(false);
-                                    plot.add_trace(edge_segment_trace);
-                                }
+                                all_jaccard_indices_for_this_plot.push(*edge_ref.weight());
                             }
                         }
-                    }
-                    let mut all_plot_annotations: Vec<Annotation> = Vec::new();
-                    let text_positions_cycle = vec![
-                        (-30, 20),  // top left
-                        (30, 10),   // top right
-                        (-30, -20), // bottom left
-                        (30, -10),  // bottom right
-                    ];
-                    let mut annotation_offset_idx_counter = 0;
-
-                    let mut all_nodes_x: Vec<f32> = Vec::new();
-                    let mut all_nodes_y: Vec<f32> = Vec::new();
-                    let mut all_nodes_hover_text: Vec<String> = Vec::new();
-                    let mut all_nodes_color_values: Vec<f64> = Vec::new(); 
-                    let mut all_nodes_sizes: Vec<f64> = Vec::new();
-
-                    struct NodeAnnotationInfo {
-                        x: f32,
-                        y: f32,
-                        go_id: u32,
-                    }
-                    let mut node_info_for_sorting_annotations: Vec<NodeAnnotationInfo> = Vec::new();
-
-                    let mut all_edges_coordinates: Vec<((f64, f64), (f64, f64))> = Vec::new();
-
-                    for graph in layouts_vec.iter() {
-                        for (node_plot_data, location) in graph.node_weights() {
-                            all_nodes_x.push(location.x);
-                            all_nodes_y.push(location.y);
-                            all_nodes_hover_text.push(node_plot_data.hover_text.clone());
-                            all_nodes_color_values.push(node_plot_data.lor);
-                            all_nodes_sizes.push(node_plot_data.size_statistic as f64);
-                            
-                            node_info_for_sorting_annotations.push(NodeAnnotationInfo {
-                                x: location.x,
-                                y: location.y,
-                                go_id: node_plot_data.go_id,
-                            });
-
-                            node_info_for_sorting_annotations.sort_by(|a, b| {
-                                a.y.total_cmp(&b.y) 
-                                    .then_with(|| a.x.total_cmp(&b.x))
-                            });
-                        }
 
-                        for edge_ref in graph.edge_references() {
-                            let source_idx = edge_ref.source();
-                            let target_idx = edge_ref.target();
+                        let min_jaccard_opt = all_jaccard_indices_for_this_plot.iter().copied().reduce(f32::min);
+                        let max_jaccard_opt = all_jaccard_indices_for_this_plot.iter().copied().reduce(f32::max);
+
+                        let min_jaccard_value = if let Some(val) = min_jaccard_opt {
+                            val
+                        } else {
+                            0.0 
+                        };
+                        let max_jaccard_value = if let Some(val) = max_jaccard_opt {
+                            val
+                        } else {
+                            0.0 
+                        };
+                        let mid_jaccard_value = (min_jaccard_value + max_jaccard_value) / 2.0;
+                    
+                        let jaccard_group_name = "Jaccard Index";
+                        plot.add_trace(create_edge_width_legend_trace(
+                            format!("{:.3}", min_jaccard_value),
+                            MIN_EDGE_WIDTH,
+                            jaccard_group_name,
+                            Some("Jaccard Index".to_owned())
+                        ));
+
+                        plot.add_trace(create_edge_width_legend_trace(
+                            format!("{:.3}", mid_jaccard_value),
+                            (MIN_EDGE_WIDTH + MAX_EDGE_WIDTH) / 2.0,
+                            jaccard_group_name,
+                            None
+                        ));
+                        plot.add_trace(create_edge_width_legend_trace(
+                            format!("{:.3}", max_jaccard_value),
+                            MAX_EDGE_WIDTH,
+                            jaccard_group_name,
+                            None
+                        ));
+
+                        if let (Some(min_jaccard), Some(max_jaccard)) = (min_jaccard_opt, max_jaccard_opt) {
+                            const EDGE_WIDTH_BUCKETS: usize = 5;
+                            let mut bucket_x_coords: Vec<Vec<Option<f64>>> = vec![Vec::new(); EDGE_WIDTH_BUCKETS];
+                            let mut bucket_y_coords: Vec<Vec<Option<f64>>> = vec![Vec::new(); EDGE_WIDTH_BUCKETS];
+
+                            for graph in layouts_vec.iter() {
+                                for edge_ref in graph.edge_references() {
+                                    let jaccard_index_val = *edge_ref.weight();
+                                    let source_idx = edge_ref.source();
+                                    let target_idx = edge_ref.target();
+
+                                    if let (Some(source_node_info), Some(target_node_info)) =
+                                        (graph.node_weight(source_idx), graph.node_weight(target_idx))
+                                    {
+                                        let normalized_val = if max_jaccard <= min_jaccard {
+                                            0.5
+                                        } else {
+                                            (jaccard_index_val - min_jaccard) as f64 / (max_jaccard - min_jaccard) as f64
+                                        };
+                                        let bucket = (normalized_val.clamp(0.0, 1.0) * (EDGE_WIDTH_BUCKETS - 1) as f64).round() as usize;
+
+                                        bucket_x_coords[bucket].extend([
+                                            Some(source_node_info.1.x as f64),
+                                            Some(target_node_info.1.x as f64),
+                                            None
+                                        ]);
+                                        bucket_y_coords[bucket].extend([
+                                            Some(source_node_info.1.y as f64),
+                                            Some(target_node_info.1.y as f64),
+                                            None
+                                        ]);
+                                    }
+                                }
+                            }
 
-                            if let (Some(source_node_info), Some(target_node_info)) =
-                                (graph.node_weight(source_idx), graph.node_weight(target_idx))
+                            for (bucket, (x_coords, y_coords)) in bucket_x_coords
+                                .into_iter()
+                                .zip(bucket_y_coords)
+                                .enumerate()
                             {
-                                let source_coords = (source_node_info.1.x as f64, source_node_info.1.y as f64);
-                                let target_coords = (target_node_info.1.x as f64, target_node_info.1.y as f64);
-                                all_edges_coordinates.push((source_coords, target_coords));
+                                if x_coords.is_empty() {
+                                    continue;
+                                }
+                                let edge_width = MIN_EDGE_WIDTH
+                                    + (MAX_EDGE_WIDTH - MIN_EDGE_WIDTH) * bucket as f64 / (EDGE_WIDTH_BUCKETS - 1) as f64;
+
+                                let edge_bucket_trace = Scatter::new(x_coords, y_coords)
+                                    .mode(Mode::Lines)
+                                    .line(
+                                        Line::new()
+                                            .width(edge_width)
+                                            .color(Rgba::new(200, 200, 200, 0.5))
+                                    )
+                                    .show_legend(false);
+                                plot.add_trace(edge_bucket_trace);
+                            }
+                        }
+                        let mut all_plot_annotations: Vec<Annotation> = Vec::new();
+                        let text_positions_cycle = vec![
+                            (-30, 20),  // top left
+                            (30, 10),   // top right
+                            (-30, -20), // bottom left
+                            (30, -10),  // bottom right
+                        ];
+                        let mut annotation_offset_idx_counter = 0;
+
+                        let mut all_nodes_x: Vec<f32> = Vec::new();
+                        let mut all_nodes_y: Vec<f32> = Vec::new();
+                        let mut all_nodes_hover_text: Vec<String> = Vec::new();
+                        let mut all_nodes_color_values: Vec<f64> = Vec::new(); 
+                        let mut all_nodes_sizes: Vec<usize> = Vec::new();
+
+                        struct NodeAnnotationInfo {
+                            x: f32,
+                            y: f32,
+                            go_id: u32,
+                        }
+                        let mut node_info_for_sorting_annotations: Vec<NodeAnnotationInfo> = Vec::new();
+
+                        for graph in layouts_vec.iter_mut() {
+                            for (node_plot_data, location) in graph.node_weights_mut() {
+                                all_nodes_x.push(location.x);
+                                all_nodes_y.push(location.y);
+                                all_nodes_hover_text.push(std::mem::take(&mut node_plot_data.hover_text));
+                                all_nodes_color_values.push(node_plot_data.lor as f64);
+                                all_nodes_sizes.push(node_plot_data.size_statistic);
+                            
+                                node_info_for_sorting_annotations.push(NodeAnnotationInfo {
+                                    x: location.x,
+                                    y: location.y,
+                                    go_id: node_plot_data.go_id,
+                                });
                             }
                         }
 
-                    }
+                        node_info_for_sorting_annotations.sort_by(|a, b| {
+                            a.y.total_cmp(&b.y) 
+                                .then_with(|| a.x.total_cmp(&b.x))
+                        });
 
-                    for sorted_node_info in node_info_for_sorting_annotations {
-                        let (x_shift, y_shift) =
-                            &text_positions_cycle[annotation_offset_idx_counter % text_positions_cycle.len()];
-                        annotation_offset_idx_counter += 1;
+                        for sorted_node_info in node_info_for_sorting_annotations {
+                            let (x_shift, y_shift) =
+                                &text_positions_cycle[annotation_offset_idx_counter % text_positions_cycle.len()];
+                            annotation_offset_idx_counter += 1;
                     
-                        let annotation = Annotation::new()
-                            .x(sorted_node_info.x as f64)
-                            .y(sorted_node_info.y as f64)
-                            .text(format!("GO:{:07}", sorted_node_info.go_id))
-                            .show_arrow(true)
-                            .font(Font::new().size(10).color(NamedColor::Black))
-                            .arrow_head(2)
-                            .arrow_size(1.0)
-                            .arrow_width(1.1)
-                            .arrow_color(NamedColor::Black)
-                            .ax(*x_shift)
-                            .ay(*y_shift)
-                            .opacity(0.9);
-                        all_plot_annotations.push(annotation);
-                    }
+                            let annotation = Annotation::new()
+                                .x(sorted_node_info.x as f64)
+                                .y(sorted_node_info.y as f64)
+                                .text(format!("GO:{:07}", sorted_node_info.go_id))
+                                .show_arrow(true)
+                                .font(Font::new().size(10).color(NamedColor::Black))
+                                .arrow_head(2)
+                                .arrow_size(1.0)
+                                .arrow_width(1.1)
+                                .arrow_color(NamedColor::Black)
+                                .ax(*x_shift)
+                                .ay(*y_shift)
+                                .opacity(0.9);
+                            all_plot_annotations.push(annotation);
+                        }
                     
-                    let min_size: f64 = 10.0;
-                    let mid_size: f64 = 13.0;
-                    let max_size: f64 = 35.0;
-
-                    let min_stat: f64 = all_nodes_sizes
-                        .iter()
-                        .copied()
-                        .reduce(f64::min)
-                        .unwrap_or(0.0);
+                        let (node_sizes, min_stat, max_stat) = scale_marker_sizes(&all_nodes_sizes);
+                        let mid_stat: usize = (min_stat + max_stat) / 2;
+
+                        let go_term_size_group_name = "GO Term size";
+                        plot.add_trace(create_size_legend_trace(
+                            format!("{}", min_stat),
+                            MIN_MARKER_SIZE as usize,
+                            go_term_size_group_name,
+                            Some("GO Term size".to_owned()),
+                        ));
+                        plot.add_trace(create_size_legend_trace(
+                            format!("{}", mid_stat),
+                            MID_MARKER_SIZE as usize,
+                            go_term_size_group_name,
+                            None,
+                        ));
+                        plot.add_trace(create_size_legend_trace(
+                            format!("{}", max_stat),
+                            MAX_MARKER_SIZE as usize,
+                            go_term_size_group_name,
+                            None,
+                        ));
+
+                        let node_trace = Scatter::new(all_nodes_x, all_nodes_y)
+                            .mode(Mode::Markers)
+                            .marker(
+                                Marker::new()
+                                    .color_array(all_nodes_color_values)
+                                    .color_scale(ColorScale::Palette(ColorScalePalette::Viridis))
+                                    .color_bar(NETWORK_PLOT_COLOR_BAR.clone())
+                                    .size_array(node_sizes)
+                                    .show_scale(true)
+                                    .opacity(1.0)
+                                )
+                            .hover_text_array(all_nodes_hover_text) 
+                            .hover_info(HoverInfo::Text) 
+                            .show_legend(false);
+
+                        plot.add_trace(node_trace);
+
+                        plot.set_layout(NETWORK_PLOT_LAYOUT.clone().annotations(all_plot_annotations));
+
+                        let namespace_subdir = get_namespace_subdir(*namespace, plots_dir)?;
+                    
+                        save_plot(&plot, &namespace_subdir, &taxon_name, "network_plot", ImageFormat::SVG, plot_type);
 
-                    let max_stat: f64 = all_nodes_sizes
-                        .iter()
-                        .copied()
-                        .reduce(f64::max)
-                        .unwrap_or(0.0);
+                        Ok::<(), Box<dyn Error + Send + Sync>>(())
+                    })
+            })
+    })?;
 
-                    let mid_stat_float: f64 = (min_stat as f64 + max_stat as f64) / 2.0;
-                    let mid_stat: usize = mid_stat_float as usize;
+Ok(())
+}
 
-                    let node_sizes: Vec<usize> = all_nodes_sizes
-                        .iter()
-                        .map(|&stat| {
-                            let scaled_size_f64 = if max_stat == min_stat {
-                                min_size + (max_size - min_size) / 2.0
-                            } else {
-                                let normalized_size = (stat as f64 - min_stat) / (max_stat - min_stat);
-                                min_size + (normalized_size * (max_size - min_size))
-                            };
-                            scaled_size_f64.round() as usize
-                        })
-                        
-                        .collect();
+fn save_plot(
+    plot: &Plot,
+    namespace_subdir: &PathBuf,
+    taxon_name: &str,
+    plot_name: &str,
+    image_format: ImageFormat,
+    plot_type: PlotType
+) {
+    let file_stem = format!("{}_{}", sanitize_filename(taxon_name), plot_name);
 
-                    let go_term_size_group_name = "GO Term size";
-                    plot.add_trace(create_size_legend_trace(
-                        format!("{}", min_stat),
-                        min_size as usize,
-                        go_term_size_group_name,
-                        Some("GO Term size".to_owned()),
-                    ));
-                    plot.add_trace(create_size_legend_trace(
-                        format!("{}", mid_stat),
-                        mid_size as usize,
-                        go_term_size_group_name,
-                        None,
-                    ));
-                    plot.add_trace(create_size_legend_trace(
-                        format!("{}", max_stat),
-                        max_size as usize,
-                        go_term_size_group_name,
-                        None,
-                    ));
-
-                    let color_bar = ColorBar::new()
-                        .title(
-                            Title::from("log(Odds Ratio)")
-                                .side(Side::Right)
-                                .font(Font::new().size(12)),
-                        )
-                        .tick_font(Font::new().size(10))
-                        .len_mode(ThicknessMode::Pixels)
-                        .len(150)
-                        .thickness(15)
-                        .x(1.0)
-                        .y(0.85)
-                        .y_anchor(Anchor::Middle);
-
-                    let node_trace = Scatter::new(all_nodes_x, all_nodes_y)
-                        .mode(Mode::Markers)
-                        .marker(
-                            Marker::new()
-                                .color_array(all_nodes_color_values)
-                                .color_scale(ColorScale::Palette(ColorScalePalette::Viridis))
-                                .color_bar(color_bar)
-                                .size_array(node_sizes)
-                                .show_scale(true)
-                                .opacity(1.0)
-                            )
-                        .hover_text_array(all_nodes_hover_text) 
-                        .hover_info(HoverInfo::Text) 
-                        .show_legend(false);
-
-                    let mut edge_x_coords: Vec<Option<f64>> = Vec::new();
-                    let mut edge_y_coords: Vec<Option<f64>> = Vec::new();
-
-                    for (i, edge) in all_edges_coordinates.iter().enumerate() {
-                        let ((x_start, y_start), (x_end, y_end)) = edge;
-
-                        edge_x_coords.push(Some(*x_start));
-                        edge_y_coords.push(Some(*y_start));
-                        edge_x_coords.push(Some(*x_end));
-                        edge_y_coords.push(Some(*y_end));
-
-                        if i < all_edges_coordinates.len() - 1 {
-                            edge_x_coords.push(None);
-                            edge_y_coords.push(None);
-                        }
+    match plot_type {
+        PlotType::Interactive => {
+            plot.write_html(namespace_subdir.join(format!("{}.html", file_stem)));
+        }
+        PlotType::Static => {
+            plot.write_image(namespace_subdir.join(format!("{}.svg", file_stem)), image_format, 940, 460, 1.0);
+        }
+        PlotType::Both => {
+            let html_path = namespace_subdir.join(format!("{}.html", file_stem));
+            let html_content = plot.to_html();
+            std::thread::scope(|scope| {
+                scope.spawn(|| {
+                    if let Err(e) = fs::write(&html_path, html_content) {
+                        eprintln!("[ERROR] Failed to write {}: {}", html_path.display(), e);
                     }
-
-                    plot.add_trace(node_trace);
-
-                    let layout = Layout::new()
-                        .width(940)
-                        .height(460)
-                        .margin(Margin::new()
-                            .left(50)
-                            .right(0)
-                            .top(30)
-                            .bottom(0))
-                        .x_axis(
-                            Axis::new()
-                                .show_line(false)
-                                .zero_line(false)
-                                .show_grid(true)
-                                .show_tick_labels(false)
-                                .auto_margin(true)
-                        )
-                        .y_axis(
-                            Axis::new() 
-                                .show_line(false)
-                                .zero_line(false)
-                                .show_grid(true)
-                                .show_tick_labels(false)
-                                .auto_margin(true)
-                        )
-                        .annotations(all_plot_annotations)
-                        .legend(
-                            Legend::new()
-                                .x(1.0)
-                                .y(0.45)
-                                .trace_group_gap(10)
-                                .trace_order(TraceOrder::Grouped)
-                                .item_click(ItemClick::False)
-                                .item_double_click(ItemClick::False)
-                        );
-                    plot.set_layout(layout);
-
-                    let namespace_subdir = get_namespace_subdir(namespace, plots_dir)?;
-                    
-                    match plot_type {
-                        PlotType::Interactive => {
-                            let html_file = namespace_subdir.join(format!("{}_network_plot.html", sanitize_filename(&taxon_name)));
-                            plot.write_html(html_file); 
-                        }
-                        PlotType::Static => {
-                            let svg_file = namespace_subdir.join(format!("{}_network_plot.svg", taxon_name));
-                            plot.write_image(svg_file, ImageFormat::SVG, 940, 460, 1.0);
-                        }
-                        PlotType::Both => {
-                            let html_file = namespace_subdir.join(format!("{}_network_plot.html", sanitize_filename(&taxon_name)));
-                            plot.write_html(html_file); 
-        
-                            let svg_file = namespace_subdir.join(format!("{}_network_plot.svg", taxon_name));
-                            plot.write_image(svg_file, ImageFormat::SVG, 940, 460, 1.0);
-                        }
-                        PlotType::None => {}
-        
-                    }  
-
-                    Ok::<(), Box<dyn Error + Send + Sync>>(())
-                })
-        })?;
-
-Ok(())
+                });
+                plot.write_image(namespace_subdir.join(format!("{}.svg", file_stem)), image_format, 940, 460, 1.0);
+            });
+        }
+        PlotType::None => {}
+    }
 }
 
 fn sanitize_filename(name: &str) -> String {
-    name.replace("/", "_")
-        .replace(":", "_")
-        .replace("\\", "_")
-        .replace("*", "_")
-        .replace("?", "_")
-        .replace("\"", "_")
-        .replace("<", "_")
-        .replace(">", "_")
-        .replace("|", "_")
+    name.chars()
+        .map(|c| match c {
+            '/' | ':' | '\\' | '*' | '?' | '"' | '<' | '>' | '|' => '_',
+            _ => c,
+        })
+        .collect()
 }
\ No newline at end of file
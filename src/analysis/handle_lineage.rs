@@ -5,41 +5,73 @@ use std::path::Path;
 use crate::analysis::enrichment_analysis::*;
 use crate::parsers::background_parser::TaxonID;
 
-pub fn read_lineage<P: AsRef<Path>>(path: P) -> Result<FxHashMap<TaxonID, Vec<String>>> {
+fn for_each_lineage_record<P, F>(path: P, mut handle_record: F) -> Result<()>
+where
+    P: AsRef<Path>,
+    F: FnMut(TaxonID, &str, std::str::Split<'_, char>),
+{
     let file = File::open(path)?;
-    let reader = BufReader::with_capacity(32 * 1024, file);
-    let mut taxonomy = FxHashMap::default();
+    let mut reader = BufReader::with_capacity(32 * 1024, file);
+    let mut line = String::with_capacity(256);
 
-    for line in reader.lines().skip(1) {
-        let line = line?;
-        let fields: Vec<&str> = line.split('\t').collect();
-        
-        if let Ok(taxon_id) = fields[0].parse::<u32>() {
-            let lineage = fields[2..].iter()
-                .map(|&s| s.to_string())
-                .collect();
-            taxonomy.insert(taxon_id, lineage);
+    reader.read_line(&mut line)?;
+    loop {
+        line.clear();
+        if reader.read_line(&mut line)? == 0 {
+            break;
+        }
+        let mut fields = line.trim_end_matches(['\n', '\r']).split('\t');
+
+        if let (Some(Ok(taxon_id)), Some(species_name)) =
+            (fields.next().map(|field| field.parse::<TaxonID>()), fields.next())
+        {
+            handle_record(taxon_id, species_name, fields);
         }
     }
+    Ok(())
+}
+
+pub fn read_lineage<P: AsRef<Path>>(path: P) -> Result<FxHashMap<TaxonID, Vec<String>>> {
+    let mut taxonomy: FxHashMap<TaxonID, Vec<String>> = FxHashMap::default();
+
+    for_each_lineage_record(path, |taxon_id, _species_name, lineage_fields| {
+        taxonomy.insert(taxon_id, lineage_fields.map(str::to_string).collect());
+    })?;
     Ok(taxonomy)
 }
-pub fn taxid_to_species<P: AsRef<Path>>(path: P) -> Result<FxHashMap<TaxonID, String>> {
-    let file = File::open(path)?;
-    let reader = BufReader::with_capacity(32 * 1024, file);
+
+pub fn read_species_and_lineage<P: AsRef<Path>>(
+    path: P
+) -> Result<(FxHashMap<TaxonID, String>, FxHashMap<TaxonID, Vec<String>>)> {
     let mut taxid_species_map = FxHashMap::default();
+    let mut taxonomy: FxHashMap<TaxonID, Vec<String>> = FxHashMap::default();
 
-    for line in reader.lines().skip(1) {
-        let line = line?;
-        let fields: Vec<&str> = line.split('\t').collect();
+    for_each_lineage_record(path, |taxon_id, species_name, lineage_fields| {
+        taxid_species_map.insert(taxon_id, species_name.to_string());
+        taxonomy.insert(taxon_id, lineage_fields.map(str::to_string).collect());
+    })?;
+    Ok((taxid_species_map, taxonomy))
+}
 
-        if let Ok(taxon_id) = fields[0].parse::<u32>() {
-            let species_name = fields[1].to_string();
-            taxid_species_map.insert(taxon_id, species_name);
-        }
-    }
+pub fn taxid_to_species<P: AsRef<Path>>(path: P) -> Result<FxHashMap<TaxonID, String>> {
+    let mut taxid_species_map: FxHashMap<TaxonID, String> = FxHashMap::default();
+
+    for_each_lineage_record(path, |taxon_id, species_name, _lineage_fields| {
+        taxid_species_map.insert(taxon_id, species_name.to_string());
+    })?;
     Ok(taxid_species_map)
 }
 
+const TAXONOMIC_LEVELS: [&str; 7] = [
+    "genus",
+    "family",
+    "order",
+    "class",
+    "phylum",
+    "kingdom",
+    "superkingdom",
+];
+
 pub fn taxid_to_level(
     significant_results: &FxHashMap<u32, FxHashMap<u32, GOTermResults>>,
     taxonomic_lineage: &FxHashMap<TaxonID, Vec<String>>,
@@ -47,24 +79,23 @@ pub fn taxid_to_level(
 ) -> FxHashMap<String, Vec<TaxonID>> {
     let mut grouped_results: FxHashMap<String, Vec<u32>> = FxHashMap::default();
     
-    let level_index = match taxonomic_level.to_lowercase().as_str() {
-        "genus" => 0,
-        "family" => 1,
-        "order" => 2,
-        "class" => 3,
-        "phylum" => 4,
-        "kingdom" => 5,
-        "superkingdom" => 6,
-        _ => return grouped_results,
+    let level_index = match TAXONOMIC_LEVELS
+        .iter()
+        .position(|level| level.eq_ignore_ascii_case(taxonomic_level)) {
+        Some(index) => index,
+        None => return grouped_results,
     };
 
-    for (taxon_id, _) in significant_results {
-        if let Some(lineage) = taxonomic_lineage.get(taxon_id) {
-            if let Some(level_name) = lineage.get(level_index) {
-                grouped_results
-                    .entry(level_name.to_string())
-                    .or_default()
-                    .push(*taxon_id);
+    for taxon_id in significant_results.keys() {
+        if let Some(level_name) = taxonomic_lineage
+            .get(taxon_id)
+            .and_then(|lineage| lineage.get(level_index))
+        {
+            match grouped_results.get_mut(level_name.as_str()) {
+                Some(taxa) => taxa.push(*taxon_id),
+                None => {
+                    grouped_results.insert(level_name.clone(), vec![*taxon_id]);
+                }
             }
         }
     }
@@ -100,12 +131,11 @@ pub fn get_superkingdom(
     lineage: &FxHashMap<TaxonID, Vec<String>>,
 ) -> Result<String> { 
 
-    let mut present_superkingdoms: FxHashSet<String> = FxHashSet::default();
+    let mut present_superkingdoms: FxHashSet<&str> = FxHashSet::default();
 
     for taxon_id in taxon_ids {
         if let Some(lineage_vector) = lineage.get(taxon_id) {
-            let superkingdom = lineage_vector[6].clone();
-            present_superkingdoms.insert(superkingdom);
+            present_superkingdoms.insert(lineage_vector[6].as_str());
             }
         } 
     
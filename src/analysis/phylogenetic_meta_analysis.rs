@@ -147,40 +147,45 @@ pub fn phylogenetic_meta_analysis_calculation(
     
     let exceeds_count: u32 = (0..permutations)
         .into_par_iter()
-        .map(|perm_idx| {
-            let thread_seed = seed.wrapping_add(perm_idx as u64);
-            let mut thread_rng = StdRng::seed_from_u64(thread_seed);
+        .map_init(
+            || (
+                indices.clone(),
+                Vec::<(usize, f64, f64)>::with_capacity(n),
+                Array2::<f64>::zeros((n, n)),
+            ),
+            |(indices_rand, rand_data_temp, w_matrix_rand), perm_idx| {
+                let thread_seed = seed.wrapping_add(perm_idx as u64);
+                let mut thread_rng = StdRng::seed_from_u64(thread_seed);
             
-            let mut indices_rand = indices.clone();
-            indices_rand.shuffle(&mut thread_rng);
+                indices_rand.copy_from_slice(&indices);
+                indices_rand.shuffle(&mut thread_rng);
             
-            let mut rand_data_temp: Vec<(usize, f64, f64)> = Vec::with_capacity(n);
-            for i in 0..n {
-                rand_data_temp.push((indices_rand[i], log_odds_array[i], weights[i]));
-            }
+                rand_data_temp.clear();
+                for i in 0..n {
+                    rand_data_temp.push((indices_rand[i], log_odds_array[i], weights[i]));
+                }
             
-            rand_data_temp.sort_by_key(|&(id, _, _)| id);
+                rand_data_temp.sort_by_key(|&(id, _, _)| id);
             
-            let log_odds_rand: Vec<f64> = rand_data_temp.iter().map(|&(_, lor, _)| lor).collect();
-            let weights_rand: Vec<f64> = rand_data_temp.iter().map(|&(_, _, w)| w).collect();
+                let log_odds_rand: Vec<f64> = rand_data_temp.iter().map(|&(_, lor, _)| lor).collect();
+                let weights_rand: Vec<f64> = rand_data_temp.iter().map(|&(_, _, w)| w).collect();
             
-            let mut w_matrix_rand = Array2::zeros((n, n));
-            for i in 0..n {
-                w_matrix_rand[[i, i]] = weights_rand[i];
-            }
+                for i in 0..n {
+                    w_matrix_rand[[i, i]] = weights_rand[i];
+                }
             
-            let log_odds_rand_array = Array1::from(log_odds_rand);
-            let log_odds_rand_2d = log_odds_rand_array.view().insert_axis(Axis(1));
+                let log_odds_rand_array = Array1::from(log_odds_rand);
+                let log_odds_rand_2d = log_odds_rand_array.view().insert_axis(Axis(1));
             
-            let y_new_rand = mDnew.dot(&log_odds_rand_2d);
+                let y_new_rand = mDnew.dot(&log_odds_rand_2d);
             
-            let xt_w_x_rand = x_new.t().dot(&w_matrix_rand).dot(&x_new);
-            let xt_w_e_rand = x_new.t().dot(&w_matrix_rand).dot(&y_new_rand);
-            let xt_w_x_inv_rand = 1.0 / xt_w_x_rand[[0, 0]];
-            let bpma_rand = xt_w_x_inv_rand * xt_w_e_rand[[0, 0]];
+                let xt_w_x_rand = x_new.t().dot(&*w_matrix_rand).dot(&x_new);
+                let xt_w_e_rand = x_new.t().dot(&*w_matrix_rand).dot(&y_new_rand);
+                let xt_w_x_inv_rand = 1.0 / xt_w_x_rand[[0, 0]];
+                let bpma_rand = xt_w_x_inv_rand * xt_w_e_rand[[0, 0]];
             
-            if bpma_rand >= b_pma { 1 } else { 0 }
-        })
+                if bpma_rand >= b_pma { 1 } else { 0 }
+            })
         .sum();
 
     let p_bpma = exceeds_count + 1;
@@ -4,7 +4,6 @@ use std::io::{self, BufWriter, Write};
 use std::error::Error;
 use std::path::PathBuf;
 use std::fmt::Write as FmtWrite;
-use lazy_static::lazy_static;
 
 use crate::parsers::{
     background_parser::*,
@@ -19,15 +18,13 @@ pub fn clean_directory(dir_path: &PathBuf) -> io::Result<()> {
     if dir_path.exists() && dir_path.is_dir() { 
         for entry in fs::read_dir(dir_path)? {
             let entry = entry?;
-            let path = entry.path();
+            let dir_name = entry.file_name();
 
-            if path.is_dir() {
-                if let Some(dir_name) = path.file_name() {
-                    if let Some(name_str) = dir_name.to_str() {
-                        if name_str == "combined_taxonomy_results" || name_str == "single_taxon_results" {
-                            fs::remove_dir_all(&path)?;
-                        }
-                    }
+            if let Some(name_str) = dir_name.to_str() {
+                if (name_str == "combined_taxonomy_results" || name_str == "single_taxon_results")
+                    && entry.file_type()?.is_dir()
+                {
+                    fs::remove_dir_all(entry.path())?;
                 }
             }
         }
@@ -37,17 +34,6 @@ pub fn clean_directory(dir_path: &PathBuf) -> io::Result<()> {
 
 const BUFFER_SIZE: usize = 8192 * 32;
 
-lazy_static! {
-    static ref NAMESPACE_MAPPING: FxHashMap<&'static str, &'static str> = {
-        let mut go_term_class_map = FxHashMap::default();
-        go_term_class_map.insert("biological_process", "Biological Process");
-        go_term_class_map.insert("molecular_function", "Molecular Function");
-        go_term_class_map.insert("cellular_component", "Cellular Component");
-        
-        go_term_class_map
-    };
-}
-
 struct TermCache {
     go_terms: FxHashMap<u32, String>,
 }
@@ -71,8 +57,12 @@ impl TermCache {
 }
 
 #[inline]
-fn format_namespace(namespace: &str) -> &str {
-    NAMESPACE_MAPPING.get(namespace).unwrap_or(&namespace)
+fn format_namespace(namespace: NameSpace) -> &'static str {
+    match namespace {
+        NameSpace::BiologicalProcess => "Biological Process",
+        NameSpace::MolecularFunction => "Molecular Function",
+        NameSpace::CellularComponent => "Cellular Component",
+    }
 }
 
 pub fn write_single_taxon_results(
@@ -105,12 +95,7 @@ pub fn write_single_taxon_results(
             if let Some(term) = ontology.get(go_term) {
                 if !term.is_obsolete {
                     let formatted_go_term = term_cache.get_go_term(*go_term);
-                    let namespace_str = match term.namespace {
-                        NameSpace::BiologicalProcess => "biological_process",
-                        NameSpace::MolecularFunction => "molecular_function",
-                        NameSpace::CellularComponent => "cellular_component",
-                    };
-                    let formatted_namespace = format_namespace(namespace_str);
+                    let formatted_namespace = format_namespace(term.namespace);
                     
                     line_buffer.clear();
                     
@@ -158,12 +143,7 @@ pub fn write_taxonomy_results(
             if let Some(term) = ontology.get(go_term) {
                 if !term.is_obsolete {
                     let formatted_go_term = term_cache.get_go_term(*go_term);
-                    let namespace_str = match term.namespace {
-                        NameSpace::BiologicalProcess => "biological_process",
-                        NameSpace::MolecularFunction => "molecular_function",
-                        NameSpace::CellularComponent => "cellular_component",
-                    };
-                    let formatted_namespace = format_namespace(namespace_str);
+                    let formatted_namespace = format_namespace(term.namespace);
                     
                     line_buffer.clear();
                     write!(
@@ -26,7 +26,7 @@ use TaxaGO::analysis::{
     enrichment_plots::*
 };
 
-fn get_default_asset_path(filename: &str) -> String {
+fn get_default_asset_dir() -> PathBuf {
     let cargo_home = var("CARGO_HOME")
         .unwrap_or_else(|_| {
             home_dir()
@@ -35,8 +35,11 @@ fn get_default_asset_path(filename: &str) -> String {
                 .to_string_lossy()
                 .into_owned()
         });
-    PathBuf::from(cargo_home)
-        .join("taxago_assets")
+    PathBuf::from(cargo_home).join("taxago_assets")
+}
+
+fn get_default_asset_path(asset_dir: &PathBuf, filename: &str) -> String {
+    asset_dir
         .join(filename)
         .to_string_lossy()
         .into_owned()
@@ -215,22 +218,14 @@ struct CliArgs {
 fn main() -> ExitCode{
     let cli_args: CliArgs = CliArgs::parse();
     
-    let default_obo_path = get_default_asset_path("go.obo");
-    let default_background_path = get_default_asset_path("background_pop");
-    let default_lineage_path = get_default_asset_path("lineage.txt");
-    let lineage_file = cli_args.lineage_file.unwrap_or(default_lineage_path);
-    
-    let obo_file = cli_args.obo_file.unwrap_or(default_obo_path);
-    let background_pop = cli_args.background_pop.unwrap_or(default_background_path);
+    let asset_dir = get_default_asset_dir();
+    let lineage_file = cli_args.lineage_file
+        .unwrap_or_else(|| get_default_asset_path(&asset_dir, "lineage.txt"));
     
-    let cargo_home = var("CARGO_HOME")
-            .unwrap_or_else(|_| {
-                home_dir()
-                    .expect("Could not determine home directory")
-                    .join(".cargo")
-                    .to_string_lossy()
-                    .into_owned()
-            });
+    let obo_file = cli_args.obo_file
+        .unwrap_or_else(|| get_default_asset_path(&asset_dir, "go.obo"));
+    let background_pop = cli_args.background_pop
+        .unwrap_or_else(|| get_default_asset_path(&asset_dir, "background_pop"));
 
     println!("\nAnalysis will be performed with {} core(s)", &cli_args.num_cores);
 
@@ -437,8 +432,16 @@ fn main() -> ExitCode{
         cli_args.min_odds_ratio
     );
         
-    let taxid_species_map = match taxid_to_species(lineage_file.clone()) {
-        Ok(map) => map,
+    let lineage_read_result = if cli_args.combine_results.is_some() {
+        println!("Reading taxonomic lineage information from: {}\n", lineage_file);
+        read_species_and_lineage(lineage_file.clone())
+            .map(|(species_map, lineage)| (species_map, Some(lineage)))
+    } else {
+        taxid_to_species(lineage_file.clone()).map(|species_map| (species_map, None))
+    };
+
+    let (taxid_species_map, taxonomic_lineage) = match lineage_read_result {
+        Ok(maps) => maps,
         Err(e) => {
             eprintln!("\nError reading taxonomic lineage information from '{}':", lineage_file);
             eprintln!("{}", e);
@@ -470,9 +473,8 @@ fn main() -> ExitCode{
             eprintln!("Error creating species plot  directory: {}", e);
         });
 
-        let (processed_species_data, go_term_to_protein_set) = process_species_data(
+        let (processed_species_data, species_name_to_id) = process_species_data(
             significant_species_results,
-            &study_population,
             &taxid_species_map
         );
 
@@ -480,48 +482,44 @@ fn main() -> ExitCode{
             &processed_species_data, 
             &ontology);
         
-        let _species_bar_plots = bar_plot(
-            &species_plot_data, 
-            &species_plots_subdir,
-            cli_args.save_plots
-        );
-        
-        let _species_bubble_plots = bubble_plot(
-            species_plot_data, 
-            &species_plots_subdir,
-            cli_args.save_plots);
-        
-        let species_protein_provider = ProteinDataProvider::Species(&go_term_to_protein_set);
-        let species_network_data = prepare_network_data(
-            &processed_species_data,
-            &species_protein_provider, 
-            &ontology,
-        );
+        let species_protein_provider = ProteinDataProvider::Species {
+            species_data_by_id: &study_population.go_term_to_protein_set,
+            species_name_to_id: &species_name_to_id,
+        };
+
+        let (_, species_networks) = rayon::join(
+            || {
+                let _species_bar_plots = bar_plot(
+                    &species_plot_data, 
+                    &species_plots_subdir,
+                    cli_args.save_plots
+                );
+                
+                let _species_bubble_plots = bubble_plot(
+                    &species_plot_data, 
+                    &species_plots_subdir,
+                    cli_args.save_plots);
+            },
+            || {
+                let species_network_data = prepare_network_data(
+                    &species_plot_data,
+                    &species_protein_provider,
+                );
 
-        let species_networks = build_networks(
-            &species_network_data,
-            &processed_species_data,
-            &ontology
+                build_networks(
+                    &species_network_data,
+                    &species_plot_data
+                )
+            },
         );
         
         let _species_network_plots = network_plot(
-            &species_networks, 
+            species_networks, 
             &species_plots_subdir,
             cli_args.save_plots);
     }  
     
-    if let Some(level_to_combine) = &cli_args.combine_results {
-
-        println!("Reading taxonomic lineage information from: {}\n", lineage_file);
-        
-        let lineage = match read_lineage(lineage_file.clone()) {
-            Ok(lineage) => lineage,
-            Err(e) => {
-                eprintln!("\nError reading taxonomic lineage information from '{}':", lineage_file);
-                eprintln!("{}", e);
-                return ExitCode::FAILURE;
-            }
-        };
+    if let (Some(level_to_combine), Some(lineage)) = (&cli_args.combine_results, taxonomic_lineage) {
 
         let superkingdom = match get_superkingdom(&taxon_ids, &lineage) {
             Ok(superkingdom) => superkingdom,
@@ -550,9 +548,7 @@ fn main() -> ExitCode{
             custom_path.clone()
         } else {
             let matrix_filename = format!("{}.dmat", &superkingdom);
-            let default_path = PathBuf::from(&cargo_home)
-                .join("taxago_assets")
-                .join(matrix_filename);
+            let default_path = asset_dir.join(matrix_filename);
             println!("Reading {} VCV matrix from: {:?} \n", &superkingdom, default_path);
             default_path
         };
@@ -605,34 +601,38 @@ fn main() -> ExitCode{
                 &significant_taxonomy_results, 
                 &ontology);
 
-            let _taxonomy_bar_plots = bar_plot(
-                &taxonomy_plot_data, 
-                &taxonomy_plots_subdir,
-                cli_args.save_plots);
-
-            let _taxonomy_bubble_plots = bubble_plot(
-                taxonomy_plot_data, 
-                &taxonomy_plots_subdir,
-                cli_args.save_plots);
-
             let taxonomy_protein_provider = ProteinDataProvider::Taxonomy {
                 species_data_by_id: &study_population.go_term_to_protein_set,
                 taxonomy_to_species_ids: &grouped_species,
             };
-            let taxon_network_data = prepare_network_data(
-                &significant_taxonomy_results,
-                &taxonomy_protein_provider,
-                &ontology,
-            );
-            
-            let taxon_networks = build_networks(
-                &taxon_network_data,
-                &significant_taxonomy_results,
-                &ontology
+
+            let (_, taxon_networks) = rayon::join(
+                || {
+                    let _taxonomy_bar_plots = bar_plot(
+                        &taxonomy_plot_data, 
+                        &taxonomy_plots_subdir,
+                        cli_args.save_plots);
+
+                    let _taxonomy_bubble_plots = bubble_plot(
+                        &taxonomy_plot_data, 
+                        &taxonomy_plots_subdir,
+                        cli_args.save_plots);
+                },
+                || {
+                    let taxon_network_data = prepare_network_data(
+                        &taxonomy_plot_data,
+                        &taxonomy_protein_provider,
+                    );
+                    
+                    build_networks(
+                        &taxon_network_data,
+                        &taxonomy_plot_data
+                    )
+                },
             );
             
             let _taxon_network_plots = network_plot(
-                &taxon_networks, 
+                taxon_networks, 
                 &taxonomy_plots_subdir,
                 cli_args.save_plots);
             }
@@ -67,11 +67,11 @@ pub enum BackgroundParserError {
 }
 
 pub fn map_code_to_category(
-    code: &CompactString,
+    code: &str,
     line_number: usize,
     file_path: &PathBuf,
 ) -> Result<EvidenceCategory, BackgroundParserError> {
-    match code.as_str() {
+    match code {
         "EXP" | "IDA" | "IPI" | "IMP" | "IGI" | "IEP" | "HTP" | "HDA" | "HMP" | "HGI" | "HEP" => Ok(EvidenceCategory::Experimental),
         "IBA" | "IBD" | "IKR" | "IRD" => Ok(EvidenceCategory::Phylogenetic),
         "ISS" | "ISO" | "ISA" | "ISM" | "IGC" | "RCA" => Ok(EvidenceCategory::Computational),
@@ -79,7 +79,7 @@ pub fn map_code_to_category(
         "IC" | "ND" => Ok(EvidenceCategory::Curator),
         "IEA" => Ok(EvidenceCategory::Electronic),
         _ => Err(BackgroundParserError::UnknownEvidenceCategory { 
-            category_code: code.clone(),
+            category_code: CompactString::new(code),
             line_number,
             file_path: file_path.clone(),
         }),
@@ -263,16 +263,20 @@ fn process_single_taxon(
         }
     };
 
-    let reader = BufReader::with_capacity(128 * 1024, file);
+    let mut reader = BufReader::with_capacity(128 * 1024, file);
+    let mut line = String::with_capacity(128);
+    let mut line_number: usize = 0;
 
     let mut protein_to_go_map: FxHashMap<CompactString, FxHashSet<GOTermID>> = FxHashMap::default();
     let mut go_term_counts: FxHashMap<GOTermID, usize> = FxHashMap::default();
     let mut go_term_to_protein_set: FxHashMap<GOTermID, FxHashSet<Protein>> = FxHashMap::default();
+    let mut current_protein: Option<Protein> = None;
 
-    for (line_idx, line_result) in reader.lines().enumerate() {
-        let line_number = line_idx + 1;
-        let line = match line_result {
-            Ok(l) => l,
+    loop {
+        line.clear();
+        match reader.read_line(&mut line) {
+            Ok(0) => break,
+            Ok(_) => {}
             Err(e) => {
                 return Err(BackgroundParserError::FileProcessingIoError {
                     file_path: taxon_background_path.to_path_buf(),
@@ -281,35 +285,52 @@ fn process_single_taxon(
                 });
             }
         };
-        let parts: Vec<&str> = line.split('\t').collect();
+        line_number += 1;
 
-        if parts.len() != 3 {
-            return Err(BackgroundParserError::InvalidColumnCount {
-                line_number,
-                file_path: taxon_background_path.to_path_buf(),
-                columns_found: parts.len(),
-                line_content_snippet: line.chars().take(70).collect(),
-            });
-        }
+        let record = line.trim_end_matches(['\n', '\r']);
+        let mut fields = record.split('\t');
+        let parts: [&str; 3] = match (fields.next(), fields.next(), fields.next(), fields.next()) {
+            (Some(protein), Some(go_term), Some(code), None) => [protein, go_term, code],
+            _ => {
+                let columns_found = record.split('\t').count();
+                return Err(BackgroundParserError::InvalidColumnCount {
+                    line_number,
+                    file_path: taxon_background_path.to_path_buf(),
+                    columns_found,
+                    line_content_snippet: record.chars().take(70).collect(),
+                });
+            }
+        };
 
-        let code_str = CompactString::new(parts[2]);
-        let category = map_code_to_category(&code_str, line_number, taxon_background_path)?; 
+        let category = map_code_to_category(parts[2], line_number, taxon_background_path)?; 
 
         if categories.contains(&category) {
-            let protein_compact_str = CompactString::new(parts[0]);
-            let protein_arc = Arc::new(protein_compact_str.clone());
-            
             if let Some(go_str) = parts[1].strip_prefix("GO:") {
                 if let Ok(go_id) = go_str.parse::<GOTermID>() {
-                    protein_to_go_map
-                        .entry(protein_compact_str)
-                        .or_insert_with(FxHashSet::default)
-                        .insert(go_id);
+                    let protein_arc = match &current_protein {
+                        Some(protein) if protein.as_str() == parts[0] => Arc::clone(protein),
+                        _ => {
+                            let protein = Arc::new(CompactString::new(parts[0]));
+                            current_protein = Some(Arc::clone(&protein));
+                            protein
+                        }
+                    };
+
+                    match protein_to_go_map.get_mut(protein_arc.as_str()) {
+                        Some(go_ids) => {
+                            go_ids.insert(go_id);
+                        }
+                        None => {
+                            let mut go_ids = FxHashSet::default();
+                            go_ids.insert(go_id);
+                            protein_to_go_map.insert((*protein_arc).clone(), go_ids);
+                        }
+                    }
         
                     let is_new_association_for_go_term = go_term_to_protein_set
                         .entry(go_id)
                         .or_insert_with(FxHashSet::default)
-                        .insert(Arc::clone(&protein_arc)); 
+                        .insert(protein_arc); 
                     
                     if is_new_association_for_go_term {
                         *go_term_counts.entry(go_id).or_insert(0) += 1;
@@ -3,7 +3,7 @@ use std::fs::{read_dir, File};
 use std::io::{BufRead, BufReader, ErrorKind};
 use std::path::PathBuf;
 use std::sync::Arc;
-use csv::ReaderBuilder;
+use csv::{ReaderBuilder, StringRecord};
 use rayon::prelude::*;
 use crate::parsers::background_parser::*;
 use compact_str::CompactString;
@@ -52,30 +52,34 @@ impl StudyPop {
             .has_headers(true)
             .from_reader(file);
 
-        let mut taxon_map: FxHashMap<TaxonID, FxHashSet<Protein>> = FxHashMap::default();
-
         let taxon_ids: Vec<TaxonID> = csv_reader
             .headers()
             .map_err(|e| Box::new(e) as Box<dyn std::error::Error + Send + Sync + 'static>)? 
-            .clone()
             .iter()
             .filter_map(|id| id.parse::<u32>().ok())
             .collect();
 
-        for result in csv_reader.records() {
-            let record = result.map_err(|e| Box::new(e) as Box<dyn std::error::Error + Send + Sync + 'static>)?; 
-            for (index, protein_str) in record.iter().enumerate() {
-                if let Some(&taxon_id) = taxon_ids.get(index) {
-                    if !protein_str.is_empty() {
-                        taxon_map
-                            .entry(taxon_id)
-                            .or_insert_with(FxHashSet::default)
-                            .insert(Arc::new(CompactString::new(protein_str)));
-                    }
+        let mut proteins_by_column: Vec<FxHashSet<Protein>> = vec![FxHashSet::default(); taxon_ids.len()];
+        let mut record = StringRecord::new();
+
+        while csv_reader
+            .read_record(&mut record)
+            .map_err(|e| Box::new(e) as Box<dyn std::error::Error + Send + Sync + 'static>)?
+        {
+            for (protein_set, protein_str) in proteins_by_column.iter_mut().zip(record.iter()) {
+                if !protein_str.is_empty() {
+                    protein_set.insert(Arc::new(CompactString::new(protein_str)));
                 }
             }
         }
 
+        let mut taxon_map: FxHashMap<TaxonID, FxHashSet<Protein>> = FxHashMap::default();
+        for (taxon_id, protein_set) in taxon_ids.into_iter().zip(proteins_by_column) {
+            if !protein_set.is_empty() {
+                taxon_map.entry(taxon_id).or_default().extend(protein_set);
+            }
+        }
+
         if taxon_map.is_empty() {
             return Ok(None);
         }
@@ -259,15 +263,18 @@ pub fn parse_fasta_file(
         Err(e) => return Err(Box::new(e)), 
     };
 
-    let reader = BufReader::with_capacity(128 * 1024, file);
-    let mut lines_iter = reader.lines();
+    let mut reader = BufReader::with_capacity(128 * 1024, file);
+    let mut line = String::with_capacity(128);
 
     let mut taxon_id_from_file: Option<TaxonID> = None;
     let mut protein_set: FxHashSet<Protein> = FxHashSet::default();
     let mut first_header_processed = false;
 
-    while let Some(line_result) = lines_iter.next() {
-        let line = line_result.map_err(Box::new)?; 
+    loop {
+        line.clear();
+        if reader.read_line(&mut line).map_err(Box::new)? == 0 {
+            break;
+        }
         let trimmed_line = line.trim();
 
         if trimmed_line.is_empty() {
@@ -302,8 +309,11 @@ pub fn parse_fasta_file(
 
     let taxon_id = taxon_id_from_file.unwrap(); 
 
-    while let Some(line_result) = lines_iter.next() {
-        let line = line_result.map_err(Box::new)?;
+    loop {
+        line.clear();
+        if reader.read_line(&mut line).map_err(Box::new)? == 0 {
+            break;
+        }
         let trimmed_line = line.trim();
 
         if trimmed_line.is_empty() {
@@ -351,13 +361,16 @@ fn extract_taxon_id_from_fasta(
         }
         Err(e) => return Err(Box::new(e)),
     };
-    let reader = BufReader::new(file);
-    let mut lines_iter = reader.lines();
+    let mut reader = BufReader::new(file);
+    let mut line = String::with_capacity(128);
     let mut taxon_id_to_return: Option<TaxonID> = None;
     let mut first_header_found_and_processed = false;
 
-    while let Some(line_result) = lines_iter.next() {
-        let line = line_result.map_err(Box::new)?;
+    loop {
+        line.clear();
+        if reader.read_line(&mut line).map_err(Box::new)? == 0 {
+            break;
+        }
         let trimmed_line = line.trim();
 
         if trimmed_line.is_empty() {
@@ -441,20 +454,27 @@ pub fn collect_taxon_ids(
             .filter_map(std::result::Result::ok) 
             .collect();
 
-        for entry in entries {
-            let entry_path = entry.path();
-            if entry_path.is_file() {
-                if let Some(ext) = entry_path.extension().and_then(|s| s.to_str()) {
-                    if ext == "fa" || ext == "fasta" {
-                        match extract_taxon_id_from_fasta(&entry_path) {
-                            Ok(Some(id)) => { taxon_ids.insert(id); }
-                            Ok(None) => {  }
-                            Err(_e) => {  }
-                        }
-                    }
+        let dir_taxon_ids: Vec<TaxonID> = entries
+            .par_iter()
+            .filter_map(|entry| {
+                let entry_path = entry.path();
+                match entry_path.extension().and_then(|s| s.to_str()) {
+                    Some("fa") | Some("fasta") => {}
+                    _ => return None,
                 }
-            }
-        }
+                let is_file = match entry.file_type() {
+                    Ok(file_type) if file_type.is_symlink() => entry_path.is_file(),
+                    Ok(file_type) => file_type.is_file(),
+                    Err(_) => false,
+                };
+                if !is_file {
+                    return None;
+                }
+                extract_taxon_id_from_fasta(&entry_path).ok().flatten()
+            })
+            .collect();
+
+        taxon_ids.extend(dir_taxon_ids);
     }
 
     Ok(taxon_ids)